@@ -0,0 +1,160 @@
+"""
+Response compression middleware with Brotli and gzip negotiation.
+"""
+import zlib
+from typing import Optional
+
+import brotli
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+BROTLI_QUALITY = 4
+GZIP_LEVEL = 6
+
+
+# Supported encodings in server preference order, which breaks q-value ties
+SUPPORTED_ENCODINGS = ("br", "gzip")
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """
+    Pick the supported encoding the client ranks highest in Accept-Encoding.
+
+    Encodings are ranked by q-value; ``*`` sets the q-value of encodings not
+    listed by name, and q=0 refuses an encoding.
+    """
+    qualities = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key.lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[name] = quality
+
+    wildcard = qualities.get("*", 0.0)
+    best, best_quality = None, 0.0
+    for encoding in SUPPORTED_ENCODINGS:
+        quality = qualities.get(encoding, wildcard)
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+class _Compressor:
+    """Incremental compressor for one response body."""
+
+    def __init__(self, encoding: str):
+        if encoding == "br":
+            self._compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+            self._process = self._compressor.process
+            self._flush = self._compressor.flush
+            self._finish = self._compressor.finish
+        else:
+            # wbits=31 writes a gzip header and trailer
+            self._compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+            self._process = self._compressor.compress
+            self._flush = lambda: self._compressor.flush(zlib.Z_SYNC_FLUSH)
+            self._finish = self._compressor.flush
+
+    def chunk(self, data: bytes) -> bytes:
+        """Compress and flush a chunk so streamed bodies are not held back."""
+        return self._process(data) + self._flush()
+
+    def finish(self, data: bytes = b"") -> bytes:
+        """Compress the final chunk and close the stream."""
+        return self._process(data) + self._finish()
+
+
+class CompressionMiddleware:
+    """
+    Compress responses with Brotli when accepted, falling back to gzip.
+
+    Responses that already carry a Content-Encoding (e.g. precompressed
+    payloads) and bodies under ``minimum_size`` pass through untouched.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 500):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accept_encoding = Headers(scope=scope).get("accept-encoding", "")
+        encoding = negotiate_encoding(accept_encoding)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message: Optional[Message] = None
+        compressor: Optional[_Compressor] = None
+        passthrough = False
+
+        async def send_wrapper(message: Message):
+            nonlocal start_message, compressor, passthrough
+
+            if message["type"] == "http.response.start":
+                start_message = message
+                headers = Headers(raw=message["headers"])
+                passthrough = "content-encoding" in headers
+                if passthrough:
+                    await send(message)
+                return
+
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if compressor is None:
+                headers = MutableHeaders(raw=start_message["headers"])
+                if not more_body and len(body) < self.minimum_size:
+                    passthrough = True
+                    await send(start_message)
+                    await send(message)
+                    return
+
+                compressor = _Compressor(encoding)
+                headers["Content-Encoding"] = encoding
+                headers.add_vary_header("Accept-Encoding")
+                if more_body:
+                    del headers["Content-Length"]
+                    await send(start_message)
+                    await send({
+                        "type": "http.response.body",
+                        "body": compressor.chunk(body),
+                        "more_body": True,
+                    })
+                else:
+                    compressed = compressor.finish(body)
+                    headers["Content-Length"] = str(len(compressed))
+                    await send(start_message)
+                    await send({
+                        "type": "http.response.body",
+                        "body": compressed,
+                    })
+                return
+
+            if more_body:
+                body = compressor.chunk(body)
+            else:
+                body = compressor.finish(body)
+            await send({
+                "type": "http.response.body",
+                "body": body,
+                "more_body": more_body,
+            })
+
+        await self.app(scope, receive, send_wrapper)
@@ -1,21 +1,70 @@
 """
 API routes for StakeFlow backend.
 """
-from typing import List, Optional
-from decimal import Decimal
+import asyncio
+import gzip
+import hashlib
+import re
+from typing import Annotated, List, Optional
 from datetime import datetime
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Request
+import brotli
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, desc
-from pydantic import BaseModel, Field
-
-from src.services.blockchain import get_blockchain_service, BlockchainService
-from src.models.database import Pool, Stake, StakingEvent, DailyStats, get_db
+from sqlalchemy import Row, select, func, desc
+from pydantic import AfterValidator, BaseModel, BeforeValidator, Field
+
+from src.services.blockchain import get_blockchain_service
+from src.services.cache import cached
+from src.services.stats import compute_protocol_stats, sum_uint256
+from src.api.compression import BROTLI_QUALITY, GZIP_LEVEL, negotiate_encoding
+from src.models.database import (
+    Pool, Stake, StakingEvent, DailyStats, ProtocolStatsSnapshot, EventType,
+    EVENT_NAMES, EVENT_TYPES, get_db, get_stream_session
+)
 
 router = APIRouter(prefix="/api/v1")
 
 
+# Request parameter types
+# Canonicalized once during request parsing so handlers can compare directly.
+_ADDRESS_RE = re.compile(r"^0x[0-9a-f]{40}$")
+
+
+def _normalize_address(value: str) -> str:
+    """Lowercase and validate an EVM address."""
+    value = value.lower()
+    if not _ADDRESS_RE.match(value):
+        raise ValueError("Invalid address")
+    return value
+
+
+# Event names keyed without case or underscores, so "staked", "Staked" and
+# "REWARD_CLAIMED" all match
+_EVENT_TYPES_BY_KEY = {name.lower(): event_type for name, event_type in EVENT_TYPES.items()}
+
+
+def _parse_event_type(value):
+    """Accept a contract event name (e.g. "Staked", any case) or its numeric type."""
+    if isinstance(value, str):
+        if value.isdigit():
+            return int(value)
+        event_type = _EVENT_TYPES_BY_KEY.get(value.replace("_", "").lower())
+        if event_type is None:
+            raise ValueError(
+                f"Unknown event type {value!r}, expected one of: {', '.join(EVENT_TYPES)}"
+            )
+        return event_type
+    return value
+
+
+Chain = Annotated[str, AfterValidator(str.lower)]
+Address = Annotated[str, AfterValidator(_normalize_address)]
+EventTypeParam = Annotated[EventType, BeforeValidator(_parse_event_type)]
+
+
 # Pydantic Models
 class PoolResponse(BaseModel):
     id: int
@@ -76,202 +125,271 @@ class WithdrawRequest(BaseModel):
     amount: str = Field(..., description="Amount in wei")
 
 
-# Database dependency
-async def get_db_session():
-    """Get database session."""
-    from src.models.database import async_session
-    async with async_session() as session:
-        yield session
+# Response builders
+# Rows come from our own database, so skip Pydantic validation on the hot path.
+# List endpoints return ORJSONResponse with plain dicts; the response models
+# above remain as the OpenAPI schema.
+
+# Column subsets selected by list endpoints; rows are plain tuples, not entities.
+_POOL_COLUMNS = (
+    Pool.id, Pool.pool_id, Pool.chain, Pool.staking_token, Pool.reward_token,
+    Pool.total_staked, Pool.reward_rate, Pool.lock_duration,
+    Pool.deposit_fee, Pool.withdraw_fee, Pool.is_active,
+)
+_EVENT_COLUMNS = (
+    StakingEvent.id, StakingEvent.event_type, StakingEvent.tx_hash,
+    StakingEvent.block_number, StakingEvent.pool_id, StakingEvent.user_address,
+    StakingEvent.amount, StakingEvent.reward_amount, StakingEvent.timestamp,
+)
+
+
+def _wei(value) -> Optional[str]:
+    """Format an on-chain integer amount as a decimal string."""
+    return None if value is None else f"{int(value):d}"
+
+
+def _pool_to_dict(p: Row) -> dict:
+    """Build a plain pool payload for direct ORJSON serialization."""
+    return {
+        "id": p.id,
+        "pool_id": p.pool_id,
+        "chain": p.chain,
+        "staking_token": p.staking_token,
+        "reward_token": p.reward_token,
+        "total_staked": _wei(p.total_staked),
+        "reward_rate": _wei(p.reward_rate),
+        "lock_duration": p.lock_duration,
+        "deposit_fee": p.deposit_fee,
+        "withdraw_fee": p.withdraw_fee,
+        "is_active": p.is_active,
+        "apy": None,
+    }
+
+
+def _event_to_dict(e: Row) -> dict:
+    """Build a plain event payload for direct ORJSON serialization."""
+    return {
+        "id": e.id,
+        "event_type": EVENT_NAMES[e.event_type],
+        "tx_hash": e.tx_hash,
+        "block_number": e.block_number,
+        "pool_id": e.pool_id,
+        "user_address": e.user_address,
+        "amount": _wei(e.amount),
+        "reward_amount": _wei(e.reward_amount),
+        "timestamp": e.timestamp,
+    }
+
+
+# Static payloads, serialized once at import
+_CHAINS_JSON = orjson.dumps({
+    "chains": [
+        {"id": "ethereum", "name": "Ethereum Mainnet", "chain_id": 1},
+        {"id": "arbitrum", "name": "Arbitrum One", "chain_id": 42161},
+        {"id": "base", "name": "Base", "chain_id": 8453},
+        {"id": "sepolia", "name": "Sepolia Testnet", "chain_id": 11155111},
+    ]
+})
+_CHAINS_ETAG = f'"{hashlib.sha256(_CHAINS_JSON).hexdigest()[:16]}"'
+_CHAINS_HEADERS = {
+    "Cache-Control": "public, max-age=3600",
+    "ETag": _CHAINS_ETAG,
+    "Vary": "Accept-Encoding",
+}
+# Precompressed bodies; CompressionMiddleware passes encoded responses through
+_CHAINS_ENCODED = {
+    "br": brotli.compress(_CHAINS_JSON, quality=BROTLI_QUALITY),
+    "gzip": gzip.compress(_CHAINS_JSON, GZIP_LEVEL),
+}
 
 
 # Routes
 @router.get("/health")
 async def health_check():
     """Health check endpoint."""
-    return {"status": "ok", "timestamp": datetime.utcnow()}
+    return ORJSONResponse({"status": "ok", "timestamp": datetime.utcnow()})
 
 
 @router.get("/chains")
-async def get_supported_chains():
+async def get_supported_chains(request: Request):
     """Get supported blockchain networks."""
-    return {
-        "chains": [
-            {"id": "ethereum", "name": "Ethereum Mainnet", "chain_id": 1},
-            {"id": "arbitrum", "name": "Arbitrum One", "chain_id": 42161},
-            {"id": "base", "name": "Base", "chain_id": 8453},
-            {"id": "sepolia", "name": "Sepolia Testnet", "chain_id": 11155111},
-        ]
-    }
+    if request.headers.get("if-none-match") == _CHAINS_ETAG:
+        return Response(status_code=304, headers=_CHAINS_HEADERS)
+    
+    encoding = negotiate_encoding(request.headers.get("accept-encoding", ""))
+    if encoding:
+        return Response(
+            content=_CHAINS_ENCODED[encoding],
+            media_type="application/json",
+            headers={**_CHAINS_HEADERS, "Content-Encoding": encoding}
+        )
+    return Response(
+        content=_CHAINS_JSON,
+        media_type="application/json",
+        headers=_CHAINS_HEADERS
+    )
 
 
 # Pool Routes
 @router.get("/pools", response_model=List[PoolResponse])
 async def get_pools(
-    chain: str = Query(..., description="Blockchain network"),
+    chain: Annotated[Chain, Query(description="Blockchain network")],
     active_only: bool = Query(True, description="Only active pools"),
-    db: AsyncSession = Depends(get_db_session)
+    db: AsyncSession = Depends(get_db)
 ):
     """Get all staking pools for a chain."""
-    query = select(Pool).where(Pool.chain == chain.lower())
+    query = select(*_POOL_COLUMNS).where(Pool.chain == chain)
     
     if active_only:
-        query = query.where(Pool.is_active == True)
+        query = query.where(Pool.is_active.is_(True))
     
     result = await db.execute(query)
-    pools = result.scalars().all()
+    pools = [_pool_to_dict(pool) for pool in result.all()]
     
     # Fetch APY from blockchain
     try:
         blockchain = get_blockchain_service(chain)
-        response_pools = []
+        pool_infos = await blockchain.get_pool_infos(
+            [pool["pool_id"] for pool in pools]
+        )
         for pool in pools:
-            pool_data = PoolResponse.from_orm(pool)
-            pool_info = blockchain.get_pool_info(pool.pool_id)
+            pool_info = pool_infos.get(pool["pool_id"])
             if pool_info:
-                pool_data.apy = float(pool_info.apy) / 100  # Convert from bps
-            response_pools.append(pool_data)
-        return response_pools
-    except Exception as e:
+                pool["apy"] = pool_info.apy / 100  # Convert from bps
+    except Exception:
         # Return pools without APY if blockchain unavailable
-        return [PoolResponse.from_orm(pool) for pool in pools]
+        pass
+    
+    # Returning a Response skips the response_model validation pass
+    return ORJSONResponse(pools)
 
 
 @router.get("/pools/{pool_id}", response_model=PoolResponse)
 async def get_pool(
     pool_id: int,
-    chain: str = Query(..., description="Blockchain network"),
-    db: AsyncSession = Depends(get_db_session)
+    chain: Annotated[Chain, Query(description="Blockchain network")],
+    db: AsyncSession = Depends(get_db)
 ):
     """Get specific pool details."""
     result = await db.execute(
-        select(Pool).where(
-            Pool.chain == chain.lower(),
+        select(*_POOL_COLUMNS).where(
+            Pool.chain == chain,
             Pool.pool_id == pool_id
         )
     )
-    pool = result.scalar_one_or_none()
+    pool = result.one_or_none()
     
     if not pool:
         raise HTTPException(status_code=404, detail="Pool not found")
     
-    pool_response = PoolResponse.from_orm(pool)
+    pool_response = _pool_to_dict(pool)
     
     # Fetch fresh data from blockchain
     try:
         blockchain = get_blockchain_service(chain)
-        pool_info = blockchain.get_pool_info(pool_id)
+        pool_info = await blockchain.get_pool_info(pool_id)
         if pool_info:
-            pool_response.total_staked = str(pool_info.total_staked)
-            pool_response.apy = float(pool_info.apy) / 100
+            pool_response["total_staked"] = _wei(pool_info.total_staked)
+            pool_response["apy"] = pool_info.apy / 100
     except Exception:
         pass
     
-    return pool_response
+    return ORJSONResponse(pool_response)
 
 
 @router.get("/pools/{pool_id}/stats")
 async def get_pool_stats(
     pool_id: int,
-    chain: str = Query(..., description="Blockchain network"),
-    db: AsyncSession = Depends(get_db_session)
+    chain: Annotated[Chain, Query(description="Blockchain network")],
+    db: AsyncSession = Depends(get_db)
 ):
     """Get pool statistics."""
-    # Get unique stakers count
-    stakers_result = await db.execute(
-        select(func.count(func.distinct(Stake.user_address)))
-        .where(
-            Stake.chain == chain.lower(),
-            Stake.pool_id == pool_id,
-            Stake.is_active == True
-        )
+    active_stakes = (
+        Stake.chain == chain,
+        Stake.onchain_pool_id == pool_id,
+        Stake.is_active.is_(True)
     )
-    unique_stakers = stakers_result.scalar()
-    
-    # Get total staked from DB
-    total_result = await db.execute(
-        select(func.sum(Stake.staked_amount))
-        .where(
-            Stake.chain == chain.lower(),
-            Stake.pool_id == pool_id,
-            Stake.is_active == True
-        )
+    unique_stakers = await db.scalar(
+        select(func.count(func.distinct(Stake.user_address))).where(*active_stakes)
     )
-    total_staked = total_result.scalar() or 0
+    total_staked = await sum_uint256(db, Stake.staked_amount, *active_stakes)
     
     # Get recent events
     events_result = await db.execute(
-        select(StakingEvent)
+        select(*_EVENT_COLUMNS)
         .where(
-            StakingEvent.chain == chain.lower(),
+            StakingEvent.chain == chain,
             StakingEvent.pool_id == pool_id
         )
         .order_by(desc(StakingEvent.timestamp))
         .limit(10)
     )
-    recent_events = events_result.scalars().all()
+    recent_events = events_result.all()
     
     return {
         "pool_id": pool_id,
         "chain": chain,
         "unique_stakers": unique_stakers,
-        "total_staked": str(total_staked),
-        "recent_events": [StakingEventResponse.from_orm(e) for e in recent_events]
+        "total_staked": _wei(total_staked),
+        "recent_events": [_event_to_dict(e) for e in recent_events]
     }
 
 
 # User Routes
 @router.get("/users/{user_address}/stakes", response_model=List[UserStakeResponse])
 async def get_user_stakes(
-    user_address: str,
-    chain: str = Query(..., description="Blockchain network"),
-    db: AsyncSession = Depends(get_db_session)
+    user_address: Address,
+    chain: Annotated[Chain, Query(description="Blockchain network")],
+    db: AsyncSession = Depends(get_db)
 ):
     """Get all stakes for a user."""
+    current_time = datetime.utcnow()
+    
+    # Lock status is evaluated by the database alongside the row fetch
+    is_locked = func.coalesce(Stake.unlock_time > current_time, False)
     result = await db.execute(
-        select(Stake, Pool.pool_id)
-        .join(Pool, Stake.pool_id == Pool.id)
+        select(Stake, is_locked)
         .where(
-            Stake.chain == chain.lower(),
-            Stake.user_address == user_address.lower(),
+            Stake.chain == chain,
+            Stake.user_address == user_address,
             Stake.is_active == True
         )
     )
     stakes = result.all()
     
-    current_time = datetime.utcnow()
-    
-    return [
-        UserStakeResponse(
-            pool_id=pool_id,
-            staked_amount=str(stake.staked_amount),
-            pending_rewards=str(stake.pending_rewards),
-            unlock_time=stake.unlock_time,
-            is_locked=stake.unlock_time and stake.unlock_time > current_time
-        )
-        for stake, pool_id in stakes
-    ]
+    return ORJSONResponse([
+        {
+            "pool_id": stake.onchain_pool_id,
+            "staked_amount": _wei(stake.staked_amount),
+            "pending_rewards": _wei(stake.pending_rewards),
+            "unlock_time": stake.unlock_time,
+            "is_locked": bool(locked),
+        }
+        for stake, locked in stakes
+    ])
 
 
 @router.get("/users/{user_address}/positions")
 async def get_user_positions(
-    user_address: str,
-    chain: str = Query(..., description="Blockchain network")
+    user_address: Address,
+    chain: Annotated[Chain, Query(description="Blockchain network")]
 ):
     """Get user positions directly from blockchain."""
     try:
         blockchain = get_blockchain_service(chain)
-        positions = blockchain.get_user_positions(user_address)
+        positions = await blockchain.get_user_positions(user_address)
         
         # Enrich with pool data
+        pool_infos = await blockchain.get_pool_infos(positions["pool_ids"])
         enriched_positions = []
         for i, pool_id in enumerate(positions["pool_ids"]):
-            pool_info = blockchain.get_pool_info(pool_id)
+            pool_info = pool_infos.get(pool_id)
             enriched_positions.append({
                 "pool_id": pool_id,
-                "staked_amount": str(positions["stakes"][i]),
-                "pending_rewards": str(positions["rewards"][i]),
+                "staked_amount": _wei(positions["stakes"][i]),
+                "pending_rewards": _wei(positions["rewards"][i]),
                 "pool_name": f"Pool #{pool_id}",
-                "apy": float(pool_info.apy) / 100 if pool_info else 0
+                "apy": pool_info.apy / 100 if pool_info else 0
             })
         
         return {
@@ -279,128 +397,148 @@ async def get_user_positions(
             "chain": chain,
             "positions": enriched_positions
         }
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="Blockchain RPC timed out")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching positions: {str(e)}")
 
 
 @router.get("/users/{user_address}/history", response_model=List[StakingEventResponse])
 async def get_user_history(
-    user_address: str,
-    chain: str = Query(..., description="Blockchain network"),
-    event_type: Optional[str] = Query(None, description="Filter by event type"),
+    user_address: Address,
+    chain: Annotated[Chain, Query(description="Blockchain network")],
+    event_type: Annotated[Optional[EventTypeParam], Query(description="Filter by event type")] = None,
     limit: int = Query(20, ge=1, le=100),
     offset: int = Query(0, ge=0),
-    db: AsyncSession = Depends(get_db_session)
+    db: AsyncSession = Depends(get_db)
 ):
     """Get staking history for a user."""
-    query = select(StakingEvent).where(
-        StakingEvent.chain == chain.lower(),
-        StakingEvent.user_address == user_address.lower()
+    query = select(*_EVENT_COLUMNS).where(
+        StakingEvent.chain == chain,
+        StakingEvent.user_address == user_address
     )
     
-    if event_type:
+    if event_type is not None:
         query = query.where(StakingEvent.event_type == event_type)
     
     query = query.order_by(desc(StakingEvent.timestamp)).offset(offset).limit(limit)
     
     result = await db.execute(query)
-    events = result.scalars().all()
+    events = result.all()
     
-    return [StakingEventResponse.from_orm(e) for e in events]
+    return ORJSONResponse([_event_to_dict(e) for e in events])
 
 
 # Events Routes
-@router.get("/events", response_model=List[StakingEventResponse])
-async def get_events(
-    chain: str = Query(..., description="Blockchain network"),
-    event_type: Optional[str] = Query(None, description="Event type filter"),
-    pool_id: Optional[int] = Query(None, description="Pool ID filter"),
-    user_address: Optional[str] = Query(None, description="User address filter"),
-    from_block: Optional[int] = Query(None),
-    to_block: Optional[int] = Query(None),
-    limit: int = Query(20, ge=1, le=100),
-    offset: int = Query(0, ge=0),
-    db: AsyncSession = Depends(get_db_session)
+def _events_query(
+    chain: str,
+    event_type: Optional[EventType],
+    pool_id: Optional[int],
+    user_address: Optional[str],
+    from_block: Optional[int],
+    to_block: Optional[int]
 ):
-    """Get staking events with filters."""
-    query = select(StakingEvent).where(StakingEvent.chain == chain.lower())
+    """Build the filtered events query shared by list and stream endpoints."""
+    query = select(*_EVENT_COLUMNS).where(StakingEvent.chain == chain)
     
-    if event_type:
+    if event_type is not None:
         query = query.where(StakingEvent.event_type == event_type)
     if pool_id is not None:
         query = query.where(StakingEvent.pool_id == pool_id)
     if user_address:
-        query = query.where(StakingEvent.user_address == user_address.lower())
+        query = query.where(StakingEvent.user_address == user_address)
     if from_block:
         query = query.where(StakingEvent.block_number >= from_block)
     if to_block:
         query = query.where(StakingEvent.block_number <= to_block)
     
-    query = query.order_by(desc(StakingEvent.timestamp)).offset(offset).limit(limit)
+    return query.order_by(desc(StakingEvent.timestamp))
+
+
+@router.get("/events", response_model=List[StakingEventResponse])
+async def get_events(
+    chain: Annotated[Chain, Query(description="Blockchain network")],
+    event_type: Annotated[Optional[EventTypeParam], Query(description="Event type filter")] = None,
+    pool_id: Optional[int] = Query(None, description="Pool ID filter"),
+    user_address: Annotated[Optional[Address], Query(description="User address filter")] = None,
+    from_block: Optional[int] = Query(None),
+    to_block: Optional[int] = Query(None),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get staking events with filters."""
+    query = _events_query(chain, event_type, pool_id, user_address, from_block, to_block)
+    query = query.offset(offset).limit(limit)
     
     result = await db.execute(query)
-    events = result.scalars().all()
+    events = result.all()
+    
+    # Returning a Response skips the response_model validation pass
+    return ORJSONResponse([_event_to_dict(e) for e in events])
+
+
+@router.get("/events/stream")
+async def stream_events(
+    chain: Annotated[Chain, Query(description="Blockchain network")],
+    event_type: Annotated[Optional[EventTypeParam], Query(description="Event type filter")] = None,
+    pool_id: Optional[int] = Query(None, description="Pool ID filter"),
+    user_address: Annotated[Optional[Address], Query(description="User address filter")] = None,
+    from_block: Optional[int] = Query(None),
+    to_block: Optional[int] = Query(None),
+    session: AsyncSession = Depends(get_stream_session)
+):
+    """Stream all matching staking events as NDJSON."""
+    query = _events_query(chain, event_type, pool_id, user_address, from_block, to_block)
+    query = query.execution_options(yield_per=500)
+    
+    async def generate():
+        # The session lives as long as the body and is closed with it
+        async with session:
+            result = await session.stream(query)
+            async for event in result:
+                yield orjson.dumps(_event_to_dict(event)) + b"\n"
     
-    return [StakingEventResponse.from_orm(e) for e in events]
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
 
 
 # Stats Routes
 @router.get("/stats")
 async def get_protocol_stats(
-    chain: str = Query(..., description="Blockchain network"),
-    db: AsyncSession = Depends(get_db_session)
+    chain: Annotated[Chain, Query(description="Blockchain network")],
+    db: AsyncSession = Depends(get_db)
 ):
-    """Get protocol statistics."""
-    # Total pools
-    pools_result = await db.execute(
-        select(func.count(Pool.id)).where(Pool.chain == chain.lower())
-    )
-    total_pools = pools_result.scalar()
-    
-    # Active stakes
-    stakes_result = await db.execute(
-        select(func.count(func.distinct(Stake.user_address)))
-        .where(
-            Stake.chain == chain.lower(),
-            Stake.is_active == True
-        )
-    )
-    total_stakers = stakes_result.scalar()
-    
-    # Total staked
-    total_staked_result = await db.execute(
-        select(func.sum(Stake.staked_amount))
-        .where(
-            Stake.chain == chain.lower(),
-            Stake.is_active == True
-        )
+    """Get protocol statistics from the pre-aggregated snapshot."""
+    result = await db.execute(
+        select(ProtocolStatsSnapshot).where(ProtocolStatsSnapshot.chain == chain)
     )
-    total_staked = total_staked_result.scalar() or 0
+    snapshot = result.scalar_one_or_none()
     
-    # Rewards distributed (from events)
-    rewards_result = await db.execute(
-        select(func.sum(StakingEvent.reward_amount))
-        .where(
-            StakingEvent.chain == chain.lower(),
-            StakingEvent.event_type.in_(["Withdrawn", "RewardClaimed"])
-        )
-    )
-    total_rewards = rewards_result.scalar() or 0
+    # Fall back to live aggregation until the first snapshot exists
+    if snapshot:
+        stats = {
+            "total_pools": snapshot.total_pools,
+            "total_stakers": snapshot.total_stakers,
+            "total_staked": snapshot.total_staked,
+            "total_rewards": snapshot.total_rewards,
+        }
+    else:
+        stats = await compute_protocol_stats(db, chain)
     
     return ProtocolStats(
         chain=chain,
-        total_staked=str(total_staked),
-        total_pools=total_pools,
-        total_stakers=total_stakers,
-        total_rewards_distributed=str(total_rewards)
+        total_staked=_wei(stats["total_staked"]),
+        total_pools=stats["total_pools"],
+        total_stakers=stats["total_stakers"],
+        total_rewards_distributed=_wei(stats["total_rewards"])
     )
 
 
 @router.get("/stats/historical")
 async def get_historical_stats(
-    chain: str = Query(..., description="Blockchain network"),
+    chain: Annotated[Chain, Query(description="Blockchain network")],
     days: int = Query(30, ge=1, le=365),
-    db: AsyncSession = Depends(get_db_session)
+    db: AsyncSession = Depends(get_db)
 ):
     """Get historical protocol statistics."""
     from datetime import timedelta
@@ -410,41 +548,47 @@ async def get_historical_stats(
     result = await db.execute(
         select(DailyStats)
         .where(
-            DailyStats.chain == chain.lower(),
+            DailyStats.chain == chain,
             DailyStats.date >= since
         )
         .order_by(DailyStats.date)
     )
     stats = result.scalars().all()
     
-    return {
+    return ORJSONResponse({
         "chain": chain,
         "period_days": days,
         "data": [
             {
-                "date": stat.date.isoformat(),
-                "total_staked": str(stat.total_staked),
-                "rewards_distributed": str(stat.total_rewards_distributed),
+                "date": stat.date,
+                "total_staked": _wei(stat.total_staked),
+                "rewards_distributed": _wei(stat.total_rewards_distributed),
                 "unique_stakers": stat.unique_stakers,
                 "new_stakes": stat.new_stakes,
                 "withdrawals": stat.withdrawals
             }
             for stat in stats
         ]
-    }
+    })
 
 
 # Token price simulation (would integrate with price oracle)
-@router.get("/prices/{token_address}")
-async def get_token_price(
-    token_address: str,
-    chain: str = Query(..., description="Blockchain network")
-):
-    """Get token price (mock implementation)."""
+@cached(key="price:{chain}:{token_address}", ttl=60)
+async def _fetch_token_price(chain: str, token_address: str) -> dict:
+    """Fetch token price (mock implementation)."""
     # In production, integrate with CoinGecko, Chainlink, etc.
     return {
         "token_address": token_address,
         "chain": chain,
         "price_usd": "1.00",  # Mock price
-        "timestamp": datetime.utcnow()
+        "timestamp": datetime.utcnow().isoformat()
     }
+
+
+@router.get("/prices/{token_address}")
+async def get_token_price(
+    token_address: Address,
+    chain: Annotated[Chain, Query(description="Blockchain network")]
+):
+    """Get token price."""
+    return await _fetch_token_price(chain, token_address)
@@ -1,10 +1,9 @@
 """
 Application configuration using Pydantic Settings.
 """
-from typing import List, Optional
-from pydantic import Field
+from typing import Optional, Tuple
 from pydantic_settings import BaseSettings
-from functools import lru_cache
+from functools import cached_property, lru_cache
 
 
 class Settings(BaseSettings):
@@ -48,17 +47,32 @@ class Settings(BaseSettings):
     # Default chain
     DEFAULT_CHAIN: str = "sepolia"
     
+    # RPC limits
+    RPC_MAX_CONCURRENCY: int = 16
+    RPC_TIMEOUT: float = 1.5
+    RPC_MAX_CONNECTIONS: int = 32
+    
     # Database
     DATABASE_URL: str = "sqlite+aiosqlite:///./stakeflow.db"
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 40
+    DB_POOL_RECYCLE: int = 1800
     
     # Redis
     REDIS_URL: str = "redis://localhost:6379/0"
+    REDIS_CONNECT_TIMEOUT: float = 0.25
+    REDIS_SOCKET_TIMEOUT: float = 0.25
+    REDIS_RETRY_INTERVAL: int = 30
     
     # Indexing
     INDEXER_BATCH_SIZE: int = 1000
     INDEXER_POLL_INTERVAL: int = 15
+    INDEXER_CATCHUP_CONCURRENCY: int = 4
     INDEX_START_BLOCK: int = 0
     
+    # Stats aggregation
+    STATS_REFRESH_INTERVAL: int = 60
+    
     # Security
     API_KEY_HEADER: str = "X-API-Key"
     ALLOWED_API_KEYS: str = ""
@@ -67,14 +81,14 @@ class Settings(BaseSettings):
     SENTRY_DSN: Optional[str] = None
     METRICS_ENABLED: bool = True
     
-    @property
-    def allowed_api_keys(self) -> List[str]:
+    @cached_property
+    def allowed_api_keys(self) -> Tuple[str, ...]:
         """Parse comma-separated API keys."""
-        return [k.strip() for k in self.ALLOWED_API_KEYS.split(",") if k.strip()]
+        return tuple(k.strip() for k in self.ALLOWED_API_KEYS.split(",") if k.strip())
     
-    @property
+    @cached_property
     def chain_configs(self) -> dict:
-        """Get chain configurations."""
+        """Get chain configurations, keyed by lowercase chain name."""
         return {
             "ethereum": {
                 "rpc_url": self.ETHEREUM_RPC_URL,
@@ -1,17 +1,22 @@
 """
 Main application entry point for StakeFlow backend.
 """
+import asyncio
 import logging
 from contextlib import asynccontextmanager
 
 import uvicorn
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 
 from src.core.config import get_settings
-from src.models.database import init_db
+from src.models.database import init_db, close_db
+from src.services.cache import init_cache, close_cache
+from src.services.blockchain import init_blockchain_services, close_blockchain_services
+from src.services.stats import run_stats_aggregator
 from src.api.routes import router
+from src.api.compression import CompressionMiddleware
 
 # Configure logging
 logging.basicConfig(
@@ -30,11 +35,21 @@ async def lifespan(app: FastAPI):
     logger.info(f"Starting {settings.APP_NAME}")
     await init_db()
     logger.info("Database initialized")
+    await init_cache()
+    services = await init_blockchain_services()
+    logger.info(f"Blockchain services ready for: {', '.join(services) or 'none'}")
+    stats_stop = asyncio.Event()
+    stats_task = asyncio.create_task(run_stats_aggregator(stats_stop))
     
     yield
     
     # Shutdown
     logger.info("Shutting down application")
+    stats_stop.set()
+    await stats_task
+    await close_blockchain_services()
+    await close_cache()
+    await close_db()
 
 
 def create_application() -> FastAPI:
@@ -46,6 +61,7 @@ def create_application() -> FastAPI:
         docs_url="/docs",
         redoc_url="/redoc",
         lifespan=lifespan,
+        default_response_class=ORJSONResponse,
     )
     
     # Add middleware
@@ -56,7 +72,7 @@ def create_application() -> FastAPI:
         allow_methods=["*"],
         allow_headers=["*"],
     )
-    app.add_middleware(GZipMiddleware, minimum_size=1000)
+    app.add_middleware(CompressionMiddleware, minimum_size=500)
     
     # Include routes
     app.include_router(router)
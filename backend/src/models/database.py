@@ -1,6 +1,14 @@
 """
-Database connection and session management.
+Database connection, session management and ORM models.
 """
+from datetime import datetime
+from decimal import Decimal
+from enum import IntEnum
+
+from sqlalchemy import (
+    Boolean, Column, DateTime, ForeignKey, Index, Integer, Numeric, SmallInteger,
+    String, TypeDecorator, UniqueConstraint
+)
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import declarative_base
 
@@ -8,11 +16,20 @@ from src.core.config import get_settings
 
 settings = get_settings()
 
+# Queue pool sizing applies to server databases; SQLite's pool takes no size
+pool_options = {} if settings.DATABASE_URL.startswith("sqlite") else {
+    "pool_size": settings.DB_POOL_SIZE,
+    "max_overflow": settings.DB_MAX_OVERFLOW,
+}
+
 # Create async engine
+# SQL echo only at DEBUG log level; stringifying every statement is costly.
 engine = create_async_engine(
     settings.DATABASE_URL,
-    echo=settings.DEBUG,
-    future=True,
+    echo=settings.LOG_LEVEL.upper() == "DEBUG",
+    pool_pre_ping=True,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    **pool_options,
 )
 
 # Create async session factory
@@ -25,16 +42,212 @@ async_session = async_sessionmaker(
 Base = declarative_base()
 
 
+class EventType(IntEnum):
+    """Staking contract event kinds, stored as SMALLINT."""
+    STAKED = 1
+    WITHDRAWN = 2
+    REWARD_CLAIMED = 3
+    EMERGENCY_WITHDRAWN = 4
+
+
+# Contract event names <-> stored event types
+EVENT_TYPES = {
+    "Staked": EventType.STAKED,
+    "Withdrawn": EventType.WITHDRAWN,
+    "RewardClaimed": EventType.REWARD_CLAIMED,
+    "EmergencyWithdrawn": EventType.EMERGENCY_WITHDRAWN,
+}
+EVENT_NAMES = {event_type: name for name, event_type in EVENT_TYPES.items()}
+
+
+class Uint256(TypeDecorator):
+    """
+    EVM uint256 stored as NUMERIC(78, 0) and exposed as Python int.
+
+    Dialects without arbitrary-precision NUMERIC (SQLite) store the decimal
+    string instead so large values survive round trips.
+    """
+    impl = Numeric(78, 0)
+    cache_ok = True
+    
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "postgresql":
+            return dialect.type_descriptor(Numeric(78, 0))
+        return dialect.type_descriptor(String(78))
+    
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        if dialect.name == "postgresql":
+            return Decimal(int(value))
+        return str(int(value))
+    
+    def process_result_value(self, value, dialect):
+        return None if value is None else int(value)
+
+
+class Block(Base):
+    """Indexed block header."""
+    __tablename__ = "blocks"
+    
+    id = Column(Integer, primary_key=True)
+    chain = Column(String(32), nullable=False)
+    number = Column(Integer, nullable=False)
+    hash = Column(String(66), nullable=False)
+    timestamp = Column(DateTime, nullable=False)
+    
+    __table_args__ = (
+        UniqueConstraint("chain", "number", name="uq_block_chain_number"),
+    )
+
+
+class Pool(Base):
+    """Staking pool configuration mirrored from chain."""
+    __tablename__ = "pools"
+    
+    id = Column(Integer, primary_key=True)
+    chain = Column(String(32), nullable=False)
+    pool_id = Column(Integer, nullable=False)
+    staking_token = Column(String(42), nullable=False)
+    reward_token = Column(String(42), nullable=False)
+    total_staked = Column(Uint256, default=0, nullable=False)
+    reward_rate = Column(Uint256, default=0, nullable=False)
+    lock_duration = Column(Integer, default=0, nullable=False)
+    deposit_fee = Column(Integer, default=0, nullable=False)
+    withdraw_fee = Column(Integer, default=0, nullable=False)
+    is_active = Column(Boolean, default=True, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    __table_args__ = (
+        UniqueConstraint("chain", "pool_id", name="uq_pool_chain_pool_id"),
+    )
+
+
+class Stake(Base):
+    """User position in a pool."""
+    __tablename__ = "stakes"
+    
+    id = Column(Integer, primary_key=True)
+    chain = Column(String(32), nullable=False)
+    pool_id = Column(Integer, ForeignKey("pools.id"), nullable=False)
+    # On-chain pool id, denormalized from Pool so reads need no join
+    onchain_pool_id = Column(Integer, nullable=False)
+    user_address = Column(String(42), nullable=False)
+    staked_amount = Column(Uint256, default=0, nullable=False)
+    pending_rewards = Column(Uint256, default=0, nullable=False)
+    last_stake_time = Column(DateTime)
+    unlock_time = Column(DateTime)
+    is_active = Column(Boolean, default=True, nullable=False)
+    
+    __table_args__ = (
+        UniqueConstraint(
+            "chain", "onchain_pool_id", "user_address", name="uq_stake_chain_pool_user"
+        ),
+        Index(
+            "ix_stake_chain_pool_active",
+            chain, onchain_pool_id, is_active,
+            postgresql_where=is_active.is_(True),
+            sqlite_where=is_active.is_(True),
+        ),
+        Index("ix_stake_chain_user", chain, user_address),
+    )
+
+
+class StakingEvent(Base):
+    """Decoded staking contract event."""
+    __tablename__ = "staking_events"
+    
+    id = Column(Integer, primary_key=True)
+    chain = Column(String(32), nullable=False)
+    event_type = Column(SmallInteger, nullable=False)
+    tx_hash = Column(String(66), nullable=False)
+    block_number = Column(Integer, nullable=False)
+    log_index = Column(Integer, nullable=False)
+    pool_id = Column(Integer, nullable=False)
+    user_address = Column(String(42), nullable=False)
+    amount = Column(Uint256)
+    reward_amount = Column(Uint256)
+    timestamp = Column(DateTime, nullable=False)
+    
+    __table_args__ = (
+        UniqueConstraint("chain", "tx_hash", "log_index", name="uq_event_chain_tx_log"),
+        Index("ix_event_chain_user_ts", chain, user_address, timestamp.desc()),
+        Index("ix_event_chain_pool_ts", chain, pool_id, timestamp.desc()),
+        Index("ix_event_chain_ts", chain, timestamp.desc()),
+        Index("ix_event_chain_type_ts", chain, event_type, timestamp.desc()),
+    )
+
+
+class DailyStats(Base):
+    """Per-chain daily protocol aggregates."""
+    __tablename__ = "daily_stats"
+    
+    id = Column(Integer, primary_key=True)
+    chain = Column(String(32), nullable=False)
+    date = Column(DateTime, nullable=False)
+    total_staked = Column(Uint256, default=0, nullable=False)
+    total_rewards_distributed = Column(Uint256, default=0, nullable=False)
+    unique_stakers = Column(Integer, default=0, nullable=False)
+    new_stakes = Column(Integer, default=0, nullable=False)
+    withdrawals = Column(Integer, default=0, nullable=False)
+    
+    __table_args__ = (
+        Index("ix_dailystats_chain_date", chain, date, unique=True),
+    )
+
+
+class ProtocolStatsSnapshot(Base):
+    """Latest pre-aggregated protocol stats per chain."""
+    __tablename__ = "protocol_stats_snapshot"
+    
+    id = Column(Integer, primary_key=True)
+    chain = Column(String(32), unique=True, nullable=False)
+    total_staked = Column(Uint256, default=0, nullable=False)
+    total_pools = Column(Integer, default=0, nullable=False)
+    total_stakers = Column(Integer, default=0, nullable=False)
+    total_rewards = Column(Uint256, default=0, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+class IndexerState(Base):
+    """Last indexed block per chain."""
+    __tablename__ = "indexer_state"
+    
+    id = Column(Integer, primary_key=True)
+    chain = Column(String(32), unique=True, nullable=False)
+    last_block_number = Column(Integer, default=0, nullable=False)
+    is_syncing = Column(Boolean, default=False, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
 async def init_db():
     """Initialize database tables."""
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
 
 
+async def close_db():
+    """Dispose of pooled database connections."""
+    await engine.dispose()
+
+
 async def get_db():
-    """Get database session dependency."""
+    """Get database session dependency, committing on success."""
     async with async_session() as session:
         try:
             yield session
-        finally:
-            await session.close()
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+
+
+def get_stream_session() -> AsyncSession:
+    """
+    Get an open session for a streaming response.
+
+    Dependencies with yield exit before a StreamingResponse body is sent,
+    so the session is returned unentered and the response's body generator
+    closes it.
+    """
+    return async_session()
@@ -1,24 +1,38 @@
 """
 Blockchain service for interacting with StakeFlow contracts.
 """
+import asyncio
+import inspect
 import json
 import logging
-from decimal import Decimal
-from typing import Dict, List, Optional, Any, Callable
-from dataclasses import dataclass
+from typing import Dict, List, Optional, Any, Awaitable, Iterable, Tuple
+from dataclasses import dataclass, asdict
 
-from web3 import Web3, AsyncWeb3
-from web3.contract import Contract
+import aiohttp
+from web3 import Web3, AsyncWeb3, AsyncHTTPProvider
+from web3.contract import AsyncContract
+from web3.datastructures import AttributeDict
+from web3._utils.events import construct_event_topic_set, get_event_data
 from web3.types import (
-    TxReceipt, LogReceipt, BlockData, EventData, FilterParams
+    TxReceipt, LogReceipt, BlockData, EventData
 )
-from eth_typing import ChecksumAddress, HexStr
-from eth_abi import decode
+from eth_typing import HexStr
+from faster_eth_abi.abi import decode, encode, default_codec as abi_codec
+from eth_utils import event_abi_to_log_topic, function_abi_to_4byte_selector, is_list_like
 
 from src.core.config import get_settings
+from src.services.cache import cached
 
 logger = logging.getLogger(__name__)
 
+# Approximate block times in seconds, used as TTL for latest-block reads
+BLOCK_TIMES = {
+    "ethereum": 12,
+    "arbitrum": 2,
+    "base": 2,
+    "sepolia": 12,
+}
+
 # Contract ABIs
 STAKING_CONTRACT_ABI = [
     {
@@ -179,31 +193,116 @@ ERC20_ABI = [
 ]
 
 
+# Multicall3 is deployed at the same address on every supported chain
+MULTICALL3_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"
+
+MULTICALL3_ABI = [
+    {
+        "inputs": [{
+            "components": [
+                {"internalType": "address", "name": "target", "type": "address"},
+                {"internalType": "bool", "name": "allowFailure", "type": "bool"},
+                {"internalType": "bytes", "name": "callData", "type": "bytes"}
+            ],
+            "internalType": "struct Multicall3.Call3[]",
+            "name": "calls",
+            "type": "tuple[]"
+        }],
+        "name": "aggregate3",
+        "outputs": [{
+            "components": [
+                {"internalType": "bool", "name": "success", "type": "bool"},
+                {"internalType": "bytes", "name": "returnData", "type": "bytes"}
+            ],
+            "internalType": "struct Multicall3.Result[]",
+            "name": "returnData",
+            "type": "tuple[]"
+        }],
+        "stateMutability": "payable",
+        "type": "function"
+    }
+]
+
+# ABI types of getPool's returned Pool struct, for decoding multicall results
+POOL_STRUCT_TYPE = "(address,address,uint256,uint256,uint256,uint256,uint256,bool,uint256,uint256)"
+
+
 @dataclass
 class PoolInfo:
     """Pool information data class."""
     pool_id: int
     staking_token: str
     reward_token: str
-    total_staked: Decimal
-    reward_rate: Decimal
+    total_staked: int
+    reward_rate: int
     lock_duration: int
     is_active: bool
     deposit_fee: int
     withdraw_fee: int
-    apy: Decimal
+    apy: int
 
 
 @dataclass
 class UserStakeInfo:
     """User stake information data class."""
-    staked_amount: Decimal
-    reward_debt: Decimal
-    pending_rewards: Decimal
+    staked_amount: int
+    reward_debt: int
+    pending_rewards: int
     last_stake_time: int
     unlock_time: int
 
 
+def _dump_pool_info(info: PoolInfo) -> str:
+    """Serialize PoolInfo for the cache."""
+    return json.dumps(asdict(info))
+
+
+def _load_pool_info(data: str) -> PoolInfo:
+    """Deserialize PoolInfo from the cache."""
+    fields = json.loads(data)
+    for name in ("total_staked", "reward_rate", "apy"):
+        fields[name] = int(fields[name])
+    return PoolInfo(**fields)
+
+
+_rpc_semaphore: Optional[asyncio.Semaphore] = None
+
+
+def _get_rpc_semaphore() -> asyncio.Semaphore:
+    """Get the semaphore bounding concurrent RPC calls across all chains."""
+    global _rpc_semaphore
+    if _rpc_semaphore is None:
+        _rpc_semaphore = asyncio.Semaphore(get_settings().RPC_MAX_CONCURRENCY)
+    return _rpc_semaphore
+
+
+_http_session: Optional[aiohttp.ClientSession] = None
+_providers: Dict[str, AsyncHTTPProvider] = {}
+
+
+def get_provider(rpc_url: str) -> AsyncHTTPProvider:
+    """Get or create the single provider for an RPC URL."""
+    if rpc_url not in _providers:
+        _providers[rpc_url] = AsyncHTTPProvider(
+            rpc_url,
+            request_kwargs={"timeout": aiohttp.ClientTimeout(total=30)}
+        )
+    return _providers[rpc_url]
+
+
+def get_http_session() -> aiohttp.ClientSession:
+    """Get or create the keep-alive HTTP session shared by all providers."""
+    global _http_session
+    if _http_session is None or _http_session.closed:
+        _http_session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=get_settings().RPC_MAX_CONNECTIONS,
+                keepalive_timeout=60
+            )
+        )
+    return _http_session
+
+
 class BlockchainService:
     """Service for blockchain interactions."""
     
@@ -212,24 +311,119 @@ class BlockchainService:
         self.settings = get_settings()
         self.chain = chain.lower()
         self.config = self.settings.get_chain_config(chain)
+        self.block_time = BLOCK_TIMES.get(self.chain, 12)
         
-        # Initialize Web3
-        self.w3 = Web3(Web3.HTTPProvider(self.config["rpc_url"]))
-        if not self.w3.is_connected():
-            raise ConnectionError(f"Failed to connect to {chain} RPC")
+        # Initialize Web3; the shared HTTP session is attached on first use
+        self.w3 = AsyncWeb3(get_provider(self.config["rpc_url"]))
+        self._session: Optional[aiohttp.ClientSession] = None
         
         # Initialize contracts
-        self.staking_contract: Contract = self.w3.eth.contract(
+        self.staking_contract: AsyncContract = self.w3.eth.contract(
             address=Web3.to_checksum_address(self.config["staking_contract"]),
             abi=STAKING_CONTRACT_ABI
         )
         
-        # Cache for token contracts
-        self._token_contracts: Dict[str, Contract] = {}
+        self.multicall_contract: AsyncContract = self.w3.eth.contract(
+            address=Web3.to_checksum_address(MULTICALL3_ADDRESS),
+            abi=MULTICALL3_ABI
+        )
+        
+        # Resolve contract functions once instead of on every call
+        functions = self.staking_contract.functions
+        self._fn_pool_count = functions.poolCount
+        self._fn_get_pool = functions.getPool
+        self._fn_get_pool_apy = functions.getPoolAPY
+        self._fn_get_user_info = functions.getUserInfo
+        self._fn_pending_rewards = functions.pendingRewards
+        self._fn_get_user_positions = functions.getUserPositions
+        self._fn_aggregate3 = self.multicall_contract.functions.aggregate3
+        
+        # Selectors for building uint256-argument calldata without ABI lookups
+        selectors = {
+            abi["name"]: function_abi_to_4byte_selector(abi)
+            for abi in STAKING_CONTRACT_ABI
+            if abi["type"] == "function"
+        }
+        self._get_pool_selector = selectors["getPool"]
+        self._get_pool_apy_selector = selectors["getPoolAPY"]
+        
+        # Event ABIs by name and by topic0, for decoding raw eth_getLogs results
+        self._event_abis: Dict[str, Dict] = {
+            abi["name"]: abi
+            for abi in STAKING_CONTRACT_ABI
+            if abi["type"] == "event"
+        }
+        self._topic0_to_event: Dict[HexStr, Dict] = {
+            Web3.to_hex(event_abi_to_log_topic(abi)): abi
+            for abi in self._event_abis.values()
+        }
+        
+        # Fast-path decode layouts for events whose indexed inputs are all
+        # address/uint256: (name, indexed (name, type) pairs, data names, data types)
+        self._fast_event_layouts: Dict[HexStr, Tuple] = {}
+        for topic0, abi in self._topic0_to_event.items():
+            indexed = [(arg["name"], arg["type"]) for arg in abi["inputs"] if arg["indexed"]]
+            data = [arg for arg in abi["inputs"] if not arg["indexed"]]
+            if all(arg_type in ("address", "uint256") for _, arg_type in indexed):
+                self._fast_event_layouts[topic0] = (
+                    abi["name"],
+                    indexed,
+                    [arg["name"] for arg in data],
+                    [arg["type"] for arg in data],
+                )
+        
+        # Cache for token contracts and their immutable metadata
+        self._token_contracts: Dict[str, AsyncContract] = {}
+        self._token_decimals: Dict[str, int] = {}
+        self._token_symbols: Dict[str, str] = {}
         
         logger.info(f"Blockchain service initialized for {chain}")
     
-    def get_token_contract(self, token_address: str) -> Contract:
+    async def _rpc(self, call: Awaitable, timeout: Optional[float] = None) -> Any:
+        """
+        Await an RPC call under the process-wide RPC semaphore.
+        
+        With ``timeout`` set, the call is abandoned with asyncio.TimeoutError
+        after that many seconds, counting time spent queued on the semaphore.
+        Request-path reads pass RPC_TIMEOUT; indexer reads rely on the
+        provider's own request timeout.
+        """
+        await self._attach_session()
+        
+        async def acquire_and_call():
+            try:
+                async with _get_rpc_semaphore():
+                    return await call
+            finally:
+                # Timed out while queued: close the never-started call
+                if inspect.iscoroutine(call):
+                    call.close()
+        
+        return await asyncio.wait_for(acquire_and_call(), timeout=timeout)
+    
+    async def _attach_session(self):
+        """Route the provider's requests through the shared keep-alive session."""
+        session = get_http_session()
+        if self._session is not session:
+            await self.w3.provider.cache_async_session(session)
+            self._session = session
+    
+    async def is_connected(self) -> bool:
+        """Check that the RPC endpoint is reachable."""
+        return await self.w3.is_connected()
+    
+    async def connect(self):
+        """
+        Attach the shared HTTP session and check the RPC endpoint.
+        
+        The check also opens the first keep-alive connection, so the first
+        real request does not pay for the TCP/TLS handshake.
+        """
+        await self._attach_session()
+        if not await self.is_connected():
+            raise ConnectionError(f"Failed to connect to {self.chain} RPC at {self.w3.provider}")
+    
+    def get_token_contract(self, token_address: str) -> AsyncContract:
         """Get or create token contract instance."""
         if token_address not in self._token_contracts:
             self._token_contracts[token_address] = self.w3.eth.contract(
@@ -238,61 +432,135 @@ class BlockchainService:
             )
         return self._token_contracts[token_address]
     
-    def get_block_number(self) -> int:
+    async def get_block_number(self) -> int:
         """Get current block number."""
-        return self.w3.eth.block_number
+        return await self._rpc(self.w3.eth.block_number)
     
-    def get_block(self, block_number: int) -> BlockData:
+    async def get_block(self, block_number: int) -> BlockData:
         """Get block by number."""
-        return self.w3.eth.get_block(block_number, full_transactions=False)
+        return await self._rpc(
+            self.w3.eth.get_block(block_number, full_transactions=False)
+        )
+    
+    async def get_blocks(self, block_numbers: List[int]) -> Dict[int, BlockData]:
+        """Get several blocks concurrently, omitting any that fail."""
+        results = await asyncio.gather(
+            *(self.get_block(number) for number in block_numbers),
+            return_exceptions=True
+        )
+        return {
+            number: block
+            for number, block in zip(block_numbers, results)
+            if not isinstance(block, BaseException)
+        }
     
-    def get_pool_count(self) -> int:
+    async def get_pool_count(self) -> int:
         """Get total number of pools."""
         try:
-            return self.staking_contract.functions.poolCount().call()
+            return await self._rpc(self._fn_pool_count().call())
         except Exception as e:
             logger.error(f"Error getting pool count: {e}")
             return 0
     
-    def get_pool_info(self, pool_id: int) -> Optional[PoolInfo]:
+    @staticmethod
+    def _to_pool_info(pool_id: int, pool_data: tuple, apy: int) -> PoolInfo:
+        """Build PoolInfo from a decoded Pool struct and APY."""
+        return PoolInfo(
+            pool_id=pool_id,
+            staking_token=Web3.to_checksum_address(pool_data[0]),
+            reward_token=Web3.to_checksum_address(pool_data[1]),
+            total_staked=pool_data[2],
+            reward_rate=pool_data[3],
+            lock_duration=pool_data[4],
+            is_active=pool_data[7],
+            deposit_fee=pool_data[8],
+            withdraw_fee=pool_data[9],
+            apy=apy
+        )
+    
+    @cached(
+        key="pool_info:{self.chain}:{pool_id}",
+        ttl=lambda self, pool_id: self.block_time,
+        dumps=_dump_pool_info,
+        loads=_load_pool_info,
+    )
+    async def get_pool_info(self, pool_id: int) -> Optional[PoolInfo]:
         """Get pool information."""
+        timeout = self.settings.RPC_TIMEOUT
         try:
-            pool_data = self.staking_contract.functions.getPool(pool_id).call()
-            apy = self.staking_contract.functions.getPoolAPY(pool_id).call()
-            
-            return PoolInfo(
-                pool_id=pool_id,
-                staking_token=pool_data[0],
-                reward_token=pool_data[1],
-                total_staked=Decimal(pool_data[2]),
-                reward_rate=Decimal(pool_data[3]),
-                lock_duration=pool_data[4],
-                is_active=pool_data[7],
-                deposit_fee=pool_data[8],
-                withdraw_fee=pool_data[9],
-                apy=Decimal(apy)
+            pool_data, apy = await asyncio.gather(
+                self._rpc(self._fn_get_pool(pool_id).call(), timeout),
+                self._rpc(self._fn_get_pool_apy(pool_id).call(), timeout)
             )
+            return self._to_pool_info(pool_id, pool_data, apy)
         except Exception as e:
             logger.error(f"Error getting pool {pool_id} info: {e}")
             return None
     
-    def get_user_info(self, pool_id: int, user_address: str) -> Optional[UserStakeInfo]:
+    async def get_pool_infos(self, pool_ids: List[int]) -> Dict[int, Optional[PoolInfo]]:
+        """Get information for several pools concurrently."""
+        results = await asyncio.gather(
+            *(self.get_pool_info(pool_id) for pool_id in pool_ids),
+            return_exceptions=True
+        )
+        return {
+            pool_id: info if isinstance(info, PoolInfo) else None
+            for pool_id, info in zip(pool_ids, results)
+        }
+    
+    async def multicall(self, calls: Iterable[Tuple[str, bytes]]) -> List[Tuple[bool, bytes]]:
+        """
+        Execute (target, calldata) pairs in a single eth_call via Multicall3.
+        
+        Sub-calls may fail individually; each result is (success, return_data).
+        """
+        call3s = [(target, True, data) for target, data in calls]
+        if not call3s:
+            return []
+        return await self._rpc(
+            self._fn_aggregate3(call3s).call()
+        )
+    
+    async def get_all_pools_info(self, count: int) -> List[PoolInfo]:
+        """Get information for pools 0..count-1 in a single RPC round trip."""
+        target = self.staking_contract.address
+        calls = []
+        for pool_id in range(count):
+            args = encode(["uint256"], [pool_id])
+            calls.append((target, self._get_pool_selector + args))
+            calls.append((target, self._get_pool_apy_selector + args))
+        
+        try:
+            results = await self.multicall(calls)
+        except Exception as e:
+            logger.error(f"Error getting pools via multicall: {e}")
+            return []
+        
+        pools = []
+        for pool_id in range(count):
+            (pool_ok, pool_ret), (apy_ok, apy_ret) = results[2 * pool_id:2 * pool_id + 2]
+            if not (pool_ok and apy_ok):
+                logger.warning(f"Multicall failed for pool {pool_id}")
+                continue
+            (pool_data,) = decode([POOL_STRUCT_TYPE], pool_ret)
+            (apy,) = decode(["uint256"], apy_ret)
+            pools.append(self._to_pool_info(pool_id, pool_data, apy))
+        return pools
+    
+    async def get_user_info(self, pool_id: int, user_address: str) -> Optional[UserStakeInfo]:
         """Get user stake information for a pool."""
+        timeout = self.settings.RPC_TIMEOUT
+        user = Web3.to_checksum_address(user_address)
         try:
-            user_data = self.staking_contract.functions.getUserInfo(
-                pool_id, 
-                Web3.to_checksum_address(user_address)
-            ).call()
-            
-            pending = self.staking_contract.functions.pendingRewards(
-                pool_id,
-                Web3.to_checksum_address(user_address)
-            ).call()
+            user_data, pending = await asyncio.gather(
+                self._rpc(self._fn_get_user_info(pool_id, user).call(), timeout),
+                self._rpc(self._fn_pending_rewards(pool_id, user).call(), timeout)
+            )
             
             return UserStakeInfo(
-                staked_amount=Decimal(user_data[0]),
-                reward_debt=Decimal(user_data[1]),
-                pending_rewards=Decimal(pending),
+                staked_amount=user_data[0],
+                reward_debt=user_data[1],
+                pending_rewards=pending,
                 last_stake_time=user_data[3],
                 unlock_time=user_data[4]
             )
@@ -300,104 +568,262 @@ class BlockchainService:
             logger.error(f"Error getting user info: {e}")
             return None
     
-    def get_user_positions(self, user_address: str) -> Dict[str, List]:
-        """Get all user positions across pools."""
+    async def get_user_positions(self, user_address: str) -> Dict[str, List]:
+        """
+        Get all user positions across pools.
+        
+        Timeouts propagate so callers can tell a slow RPC from an empty
+        portfolio.
+        """
         try:
-            positions = self.staking_contract.functions.getUserPositions(
-                Web3.to_checksum_address(user_address)
-            ).call()
+            positions = await self._rpc(
+                self._fn_get_user_positions(
+                    Web3.to_checksum_address(user_address)
+                ).call(),
+                self.settings.RPC_TIMEOUT
+            )
             
             return {
-                "pool_ids": [int(x) for x in positions[0]],
-                "stakes": [Decimal(x) for x in positions[1]],
-                "rewards": [Decimal(x) for x in positions[2]]
+                "pool_ids": list(positions[0]),
+                "stakes": list(positions[1]),
+                "rewards": list(positions[2])
             }
+        except asyncio.TimeoutError:
+            raise
         except Exception as e:
             logger.error(f"Error getting user positions: {e}")
             return {"pool_ids": [], "stakes": [], "rewards": []}
     
-    def get_token_balance(self, token_address: str, wallet_address: str) -> Decimal:
-        """Get ERC20 token balance."""
+    async def get_token_decimals(self, token_address: str) -> int:
+        """Get ERC20 decimals, fetched once per token."""
+        if token_address not in self._token_decimals:
+            token = self.get_token_contract(token_address)
+            self._token_decimals[token_address] = await self._rpc(
+                token.functions.decimals().call(), self.settings.RPC_TIMEOUT
+            )
+        return self._token_decimals[token_address]
+    
+    async def get_token_symbol(self, token_address: str) -> str:
+        """Get ERC20 symbol, fetched once per token."""
+        if token_address not in self._token_symbols:
+            token = self.get_token_contract(token_address)
+            self._token_symbols[token_address] = await self._rpc(
+                token.functions.symbol().call(), self.settings.RPC_TIMEOUT
+            )
+        return self._token_symbols[token_address]
+    
+    async def get_token_balance(self, token_address: str, wallet_address: str) -> Tuple[int, int]:
+        """
+        Get ERC20 token balance as (raw amount, decimals).
+        
+        Scaling to a human-readable amount is left to the caller's formatting.
+        """
+        timeout = self.settings.RPC_TIMEOUT
         try:
             token = self.get_token_contract(token_address)
-            balance = token.functions.balanceOf(
-                Web3.to_checksum_address(wallet_address)
-            ).call()
-            decimals = token.functions.decimals().call()
-            return Decimal(balance) / Decimal(10 ** decimals)
+            balance, decimals = await asyncio.gather(
+                self._rpc(token.functions.balanceOf(
+                    Web3.to_checksum_address(wallet_address)
+                ).call(), timeout),
+                self.get_token_decimals(token_address)
+            )
+            return balance, decimals
         except Exception as e:
             logger.error(f"Error getting token balance: {e}")
-            return Decimal(0)
+            return 0, 0
     
-    def get_events(
+    async def get_events(
         self,
         event_name: str,
         from_block: int,
         to_block: int,
         argument_filters: Optional[Dict] = None
     ) -> List[EventData]:
-        """Get contract events."""
+        """
+        Get contract events.
+        
+        Indexed ``argument_filters`` become eth_getLogs topics; filters on
+        non-indexed arguments are applied to the decoded events.
+        """
         try:
-            event = getattr(self.staking_contract.events, event_name)
-            filter_params = {"fromBlock": from_block, "toBlock": to_block}
+            event_abi = self._event_abis[event_name]
+            logs = await self._rpc(self.w3.eth.get_logs({
+                "address": self.staking_contract.address,
+                "fromBlock": from_block,
+                "toBlock": to_block,
+                "topics": construct_event_topic_set(event_abi, abi_codec, argument_filters),
+            }))
+            events = [get_event_data(abi_codec, event_abi, log) for log in logs]
             
             if argument_filters:
-                filter_params["argument_filters"] = argument_filters
-            
-            return event().get_logs(**filter_params)
+                indexed = {arg["name"] for arg in event_abi["inputs"] if arg["indexed"]}
+                data_filters = {
+                    name: value if is_list_like(value) else [value]
+                    for name, value in argument_filters.items()
+                    if name not in indexed
+                }
+                events = [
+                    event for event in events
+                    if all(event.args[name] in options for name, options in data_filters.items())
+                ]
+            return events
         except Exception as e:
             logger.error(f"Error getting events: {e}")
             return []
     
-    def get_all_events(
+    async def get_all_logs(self, from_block: int, to_block: int) -> List[LogReceipt]:
+        """Get raw logs for all staking contract events with a single eth_getLogs call."""
+        # A list at a topic position matches any of its entries
+        return await self._rpc(self.w3.eth.get_logs({
+            "address": self.staking_contract.address,
+            "fromBlock": from_block,
+            "toBlock": to_block,
+            "topics": [list(self._topic0_to_event)],
+        }))
+    
+    def decode_logs(self, logs: List[LogReceipt]) -> List[EventData]:
+        """
+        Decode raw logs, sorted by block number and log index.
+        
+        Pure CPU work with no shared state, so it can run in a worker thread.
+        """
+        events = [self.decode_log(log) for log in logs]
+        events.sort(key=lambda x: (x["blockNumber"], x["logIndex"]))
+        return events
+    
+    async def get_all_events(
         self,
         from_block: int,
         to_block: int
     ) -> List[EventData]:
-        """Get all staking contract events."""
-        events = []
-        event_names = ["Staked", "Withdrawn", "RewardClaimed", "EmergencyWithdrawn"]
+        """Get all staking contract events with a single eth_getLogs call."""
+        return self.decode_logs(await self.get_all_logs(from_block, to_block))
+    
+    def decode_log(self, log: LogReceipt) -> EventData:
+        """
+        Decode a staking contract log into EventData.
         
-        for event_name in event_names:
-            try:
-                event_logs = self.get_events(event_name, from_block, to_block)
-                events.extend(event_logs)
-            except Exception as e:
-                logger.warning(f"Error getting {event_name} events: {e}")
+        Indexed address/uint256 topics are read directly from the 32-byte
+        words (last 20 bytes, big-endian int) instead of going through the
+        ABI decoder; other layouts fall back to get_event_data.
+        """
+        topic0 = Web3.to_hex(log["topics"][0])
+        layout = self._fast_event_layouts.get(topic0)
+        if layout is None or len(log["topics"]) != len(layout[1]) + 1:
+            return get_event_data(abi_codec, self._topic0_to_event[topic0], log)
         
-        # Sort by block number and log index
-        events.sort(key=lambda x: (x["blockNumber"], x["logIndex"]))
-        return events
+        name, indexed, data_names, data_types = layout
+        args = {}
+        for (arg_name, arg_type), topic in zip(indexed, log["topics"][1:]):
+            if arg_type == "address":
+                args[arg_name] = Web3.to_checksum_address(bytes(topic[-20:]))
+            else:
+                args[arg_name] = int.from_bytes(topic, "big")
+        args.update(zip(data_names, decode(data_types, log["data"])))
+        
+        return AttributeDict({
+            "args": AttributeDict(args),
+            "event": name,
+            "logIndex": log["logIndex"],
+            "transactionIndex": log["transactionIndex"],
+            "transactionHash": log["transactionHash"],
+            "address": log["address"],
+            "blockHash": log["blockHash"],
+            "blockNumber": log["blockNumber"],
+        })
+    
+    async def get_all_logs_chunked(
+        self,
+        from_block: int,
+        to_block: int,
+        chunk_size: int,
+        concurrency: int
+    ) -> List[LogReceipt]:
+        """
+        Get raw staking contract logs as concurrent sub-range eth_getLogs calls.
+        
+        At most ``concurrency`` sub-ranges are in flight; results are
+        concatenated in sub-range order.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def fetch(start: int, end: int) -> List[LogReceipt]:
+            async with semaphore:
+                return await self.get_all_logs(start, end)
+        
+        chunks = await asyncio.gather(*(
+            fetch(start, min(start + chunk_size - 1, to_block))
+            for start in range(from_block, to_block + 1, chunk_size)
+        ))
+        return [log for chunk in chunks for log in chunk]
     
-    def estimate_gas_price(self) -> int:
+    async def estimate_gas_price(self) -> int:
         """Get current gas price."""
         try:
-            return self.w3.eth.gas_price
+            return await self._rpc(self.w3.eth.gas_price, self.settings.RPC_TIMEOUT)
         except Exception as e:
             logger.error(f"Error estimating gas price: {e}")
             return 0
     
-    def get_transaction_receipt(self, tx_hash: str) -> Optional[TxReceipt]:
+    async def get_transaction_receipt(self, tx_hash: str) -> Optional[TxReceipt]:
         """Get transaction receipt."""
         try:
-            return self.w3.eth.get_transaction_receipt(tx_hash)
+            return await self._rpc(
+                self.w3.eth.get_transaction_receipt(tx_hash),
+                self.settings.RPC_TIMEOUT
+            )
         except Exception as e:
             logger.error(f"Error getting transaction receipt: {e}")
             return None
 
 
 # Factory for blockchain services
-_blockchain_services: Dict[str, BlockchainService] = {}
+# Keyed by (chain, rpc_url) so a changed RPC URL never reuses a stale provider
+_blockchain_services: Dict[Tuple[str, str], BlockchainService] = {}
 
 
 def get_blockchain_service(chain: str = "sepolia") -> BlockchainService:
     """Get or create blockchain service for a chain."""
     chain = chain.lower()
-    if chain not in _blockchain_services:
-        _blockchain_services[chain] = BlockchainService(chain)
-    return _blockchain_services[chain]
+    key = (chain, get_settings().get_chain_config(chain)["rpc_url"])
+    if key not in _blockchain_services:
+        _blockchain_services[key] = BlockchainService(chain)
+    return _blockchain_services[key]
+
+
+async def init_blockchain_services() -> Dict[str, BlockchainService]:
+    """Eagerly create services for every configured chain and connect them concurrently."""
+    settings = get_settings()
+    services: Dict[str, BlockchainService] = {}
+    for chain, config in settings.chain_configs.items():
+        if not config.get("rpc_url") or not config.get("staking_contract"):
+            continue
+        try:
+            services[chain] = get_blockchain_service(chain)
+        except Exception as e:
+            logger.warning(f"Could not initialize blockchain service for {chain}: {e}")
+    
+    results = await asyncio.gather(
+        *(service.connect() for service in services.values()),
+        return_exceptions=True
+    )
+    for (chain, service), result in zip(services.items(), results):
+        if isinstance(result, BaseException):
+            _blockchain_services.pop((chain, service.config["rpc_url"]), None)
+            logger.warning(f"Could not initialize blockchain service for {chain}: {result}")
+    return get_all_services()
+
+
+async def close_blockchain_services():
+    """Close the shared HTTP session and drop cached services."""
+    global _http_session
+    _blockchain_services.clear()
+    _providers.clear()
+    if _http_session is not None:
+        await _http_session.close()
+        _http_session = None
 
 
 def get_all_services() -> Dict[str, BlockchainService]:
     """Get all initialized blockchain services."""
-    return _blockchain_services.copy()
+    return {chain: service for (chain, _), service in _blockchain_services.items()}
@@ -0,0 +1,124 @@
+"""
+Redis-backed caching for hot read paths.
+"""
+import functools
+import inspect
+import json
+import logging
+import time
+from typing import Any, Callable, Optional, Union
+
+import redis.asyncio as redis
+from redis.exceptions import RedisError
+
+from src.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+_client: Optional[redis.Redis] = None
+
+# Monotonic time until which Redis is bypassed after a failed call
+_down_until = 0.0
+
+
+def get_redis() -> redis.Redis:
+    """Get or create the shared Redis client."""
+    global _client
+    if _client is None:
+        settings = get_settings()
+        _client = redis.from_url(
+            settings.REDIS_URL,
+            decode_responses=True,
+            socket_connect_timeout=settings.REDIS_CONNECT_TIMEOUT,
+            socket_timeout=settings.REDIS_SOCKET_TIMEOUT
+        )
+    return _client
+
+
+def _available() -> bool:
+    """Whether Redis should be tried, i.e. no recent failure is backing off."""
+    return time.monotonic() >= _down_until
+
+
+def _mark_down(message: str, error: RedisError):
+    """Bypass Redis for the retry interval, warning once per outage window."""
+    global _down_until
+    interval = get_settings().REDIS_RETRY_INTERVAL
+    if _available():
+        logger.warning(f"{message}, bypassing cache for {interval}s: {error}")
+    _down_until = time.monotonic() + interval
+
+
+async def init_cache():
+    """Connect to Redis, logging instead of failing if it is unavailable."""
+    try:
+        await get_redis().ping()
+        logger.info("Cache connected")
+    except RedisError as e:
+        _mark_down("Cache unavailable", e)
+
+
+async def close_cache():
+    """Close the shared Redis client."""
+    global _client
+    if _client is not None:
+        await _client.close()
+        _client = None
+
+
+async def invalidate(*keys: str):
+    """Delete cached keys."""
+    if not keys or not _available():
+        return
+    try:
+        await get_redis().delete(*keys)
+    except RedisError as e:
+        _mark_down("Error invalidating cache keys", e)
+
+
+def cached(
+    key: str,
+    ttl: Union[int, Callable[..., int]],
+    dumps: Callable[[Any], str] = json.dumps,
+    loads: Callable[[str], Any] = json.loads,
+):
+    """
+    Cache the result of a coroutine in Redis.
+
+    ``key`` is a format string over the coroutine's arguments, e.g.
+    ``"pool_info:{self.chain}:{pool_id}"``. ``ttl`` is either seconds or a
+    callable receiving the same arguments. ``None`` results are not cached,
+    and Redis errors fall through to the wrapped coroutine, skipping the
+    cache until the retry interval has passed.
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            cache_key = key.format(**bound.arguments)
+            client = get_redis()
+
+            if _available():
+                try:
+                    hit = await client.get(cache_key)
+                    if hit is not None:
+                        return loads(hit)
+                except RedisError as e:
+                    _mark_down(f"Cache read failed for {cache_key}", e)
+
+            result = await func(*args, **kwargs)
+            if result is None or not _available():
+                return result
+
+            expires = ttl(*args, **kwargs) if callable(ttl) else ttl
+            try:
+                await client.setex(cache_key, expires, dumps(result))
+            except RedisError as e:
+                _mark_down(f"Cache write failed for {cache_key}", e)
+            return result
+
+        return wrapper
+    return decorator
@@ -3,20 +3,52 @@ Blockchain indexer service for StakeFlow events.
 """
 import asyncio
 import logging
+from collections import defaultdict
 from datetime import datetime, timedelta
-from typing import Optional
+from decimal import Decimal
+from typing import Dict, List, Optional, Tuple
 
+import aiohttp
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update
-from tenacity import retry, stop_after_attempt, wait_exponential
+from sqlalchemy import insert, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import OperationalError
+from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_exponential
+from web3.exceptions import ProviderConnectionError, TooManyRequests
 
 from src.services.blockchain import get_blockchain_service
+from src.services.cache import invalidate
 from src.models.database import (
-    Block, Pool, Stake, StakingEvent, DailyStats, IndexerState
+    Pool, Stake, StakingEvent, IndexerState, EVENT_TYPES
 )
 
 logger = logging.getLogger(__name__)
 
+# Transient failures (rate limits, dropped connections, timeouts) that are
+# retried in place; anything else aborts the batch and waits for the run
+# loop's backoff
+NETWORK_ERRORS = (
+    aiohttp.ClientError,
+    asyncio.TimeoutError,
+    ConnectionError,
+    ProviderConnectionError,
+    TooManyRequests,
+    OperationalError,
+)
+
+# Bounds in seconds for the run loop's exponential backoff
+MIN_BACKOFF = 0.5
+MAX_BACKOFF = 30
+
+# staking_events columns, in the order _event_record emits them
+EVENT_COLUMNS = (
+    "chain", "event_type", "tx_hash", "block_number", "log_index",
+    "pool_id", "user_address", "amount", "reward_amount", "timestamp",
+)
+
+# Event batches at least this large are written with COPY on asyncpg
+COPY_THRESHOLD = 5000
+
 
 class IndexerService:
     """Service for indexing blockchain events."""
@@ -27,6 +59,12 @@ class IndexerService:
         self.blockchain = get_blockchain_service(chain)
         self.is_running = False
         self._stop_event = asyncio.Event()
+        self._backoff = MIN_BACKOFF
+        # ((from_block, to_block), task) for the next batch fetched while
+        # the current one is written
+        self._prefetch: Optional[Tuple[Tuple[int, int], asyncio.Task]] = None
+        # pool_id -> (Pool.id, lock_duration), rebuilt by sync_pools
+        self._pool_cache: Dict[int, Tuple[int, int]] = {}
     
     async def initialize(self):
         """Initialize indexer state."""
@@ -48,21 +86,34 @@ class IndexerService:
             logger.info(f"Initialized indexer for {self.chain} at block {settings.INDEX_START_BLOCK}")
     
     @retry(
+        retry=retry_if_exception_type(NETWORK_ERRORS),
         stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=4, max=10)
+        wait=wait_exponential(multiplier=1, min=4, max=10),
+        reraise=True
     )
-    async def index_block_range(self, from_block: int, to_block: int):
-        """Index events for a range of blocks."""
+    async def index_block_range(
+        self,
+        from_block: int,
+        to_block: int,
+        sub_ranges: int = 1,
+        batch: Optional[Tuple[List[tuple], Dict]] = None
+    ):
+        """
+        Index events for a range of blocks.
+        
+        With ``sub_ranges`` > 1 the range's logs are fetched as that many
+        concurrent eth_getLogs calls. ``batch`` is the range's already
+        prepared result of _fetch_batch, when it was prefetched.
+        """
         logger.info(f"Indexing {self.chain} blocks {from_block} to {to_block}")
         
         try:
-            # Get events
-            events = self.blockchain.get_all_events(from_block, to_block)
-            
-            for event in events:
-                await self._process_event(event)
+            if batch is None:
+                batch = await self._fetch_batch(from_block, to_block, sub_ranges)
+            event_records, stake_events = batch
             
-            # Update indexer state
+            # Update indexer state first: COPY runs on the driver connection,
+            # which only joins the transaction once a statement has executed
             await self.db.execute(
                 update(IndexerState)
                 .where(IndexerState.chain == self.chain)
@@ -73,155 +124,304 @@ class IndexerService:
                 )
             )
             
+            await self._write_events(event_records)
+            
+            # Positions that only gained stake are added to server-side on
+            # Postgres, where Uint256 is NUMERIC; the rest are loaded and applied
+            server_side = self.db.bind.dialect.name == "postgresql"
+            staked_only = {
+                key for key, position_events in stake_events.items()
+                if server_side and all(event.event == "Staked" for event, _ in position_events)
+            }
+            stake_map = await self._load_stakes(
+                [key for key in stake_events if key not in staked_only]
+            )
+            await self._refresh_pool_cache({pool_id for pool_id, _ in stake_events})
+            for key, position_events in stake_events.items():
+                pool_id, user = key
+                pool = self._pool_cache.get(pool_id)
+                if key in staked_only:
+                    await self._add_stake(pool, pool_id, user, position_events)
+                else:
+                    self._apply_stake_events(
+                        pool, stake_map.get(key), pool_id, user, position_events
+                    )
+            
             await self.db.commit()
-            logger.info(f"Indexed {len(events)} events from blocks {from_block}-{to_block}")
+            logger.info(f"Indexed {len(event_records)} events from blocks {from_block}-{to_block}")
+            
+            # Pool totals changed for every pool that saw activity
+            await invalidate(*{
+                f"pool_info:{self.chain}:{pool_id}" for pool_id, _ in stake_events
+            })
             
         except Exception as e:
             logger.error(f"Error indexing blocks: {e}")
             await self.db.rollback()
             raise
     
-    async def _process_event(self, event):
-        """Process a single event."""
-        event_name = event.event
-        args = event.args
-        tx_hash = event.transactionHash.hex()
-        block_number = event.blockNumber
-        log_index = event.logIndex
+    async def _fetch_batch(
+        self,
+        from_block: int,
+        to_block: int,
+        sub_ranges: int = 1
+    ) -> Tuple[List[tuple], Dict]:
+        """
+        Fetch a range's logs and prepare them for writing.
         
-        # Get block timestamp
-        try:
-            block = self.blockchain.get_block(block_number)
-            timestamp = datetime.fromtimestamp(block.timestamp)
-        except:
-            timestamp = datetime.utcnow()
+        Decoding and record building are CPU-bound, so they run in a worker
+        thread; decoding overlaps with the block timestamp fetch.
+        """
+        if sub_ranges > 1:
+            chunk_size = -(-(to_block - from_block + 1) // sub_ranges)
+            logs = await self.blockchain.get_all_logs_chunked(
+                from_block, to_block, chunk_size, sub_ranges
+            )
+        else:
+            logs = await self.blockchain.get_all_logs(from_block, to_block)
         
-        # Create event record
-        staking_event = StakingEvent(
-            chain=self.chain,
-            event_type=event_name,
-            tx_hash=tx_hash,
-            block_number=block_number,
-            log_index=log_index,
-            pool_id=args.poolId,
-            user_address=args.user.lower(),
-            amount=str(args.amount) if hasattr(args, 'amount') else None,
-            reward_amount=str(args.rewardAmount) if hasattr(args, 'rewardAmount') else None,
-            timestamp=timestamp
+        # Fetch each distinct block once instead of once per event
+        events, blocks = await asyncio.gather(
+            asyncio.to_thread(self.blockchain.decode_logs, logs),
+            self.blockchain.get_blocks(sorted({log["blockNumber"] for log in logs}))
+        )
+        timestamps = {
+            number: datetime.fromtimestamp(block.timestamp)
+            for number, block in blocks.items()
+        }
+        return await asyncio.to_thread(self._build_batch, events, timestamps)
+    
+    def _build_batch(self, events: List, timestamps: Dict[int, datetime]) -> Tuple[List[tuple], Dict]:
+        """
+        Build event records for one bulk write and group stake changes by
+        position so each position is loaded and written once.
+        """
+        event_records = []
+        stake_events: Dict[Tuple[int, str], List] = defaultdict(list)
+        for event in events:
+            timestamp = timestamps.get(event.blockNumber) or datetime.utcnow()
+            event_records.append(self._event_record(event, timestamp))
+            key = (event.args.poolId, event.args.user.lower())
+            stake_events[key].append((event, timestamp))
+        return event_records, stake_events
+    
+    def _event_record(self, event, timestamp: datetime) -> tuple:
+        """Build a staking_events record, in EVENT_COLUMNS order, from a decoded event."""
+        args = event.args
+        return (
+            self.chain,
+            EVENT_TYPES[event.event],
+            event.transactionHash.hex(),
+            event.blockNumber,
+            event.logIndex,
+            args.poolId,
+            args.user.lower(),
+            args.amount if hasattr(args, 'amount') else None,
+            args.rewardAmount if hasattr(args, 'rewardAmount') else None,
+            timestamp,
         )
-        self.db.add(staking_event)
+    
+    async def _write_events(self, records: List[tuple]):
+        """Insert event records, with COPY for large batches on asyncpg."""
+        if not records:
+            return
         
-        # Update user stake based on event type
-        if event_name == "Staked":
-            await self._handle_stake(args.poolId, args.user.lower(), args.amount, timestamp)
-        elif event_name == "Withdrawn":
-            await self._handle_withdraw(args.poolId, args.user.lower(), args.amount, timestamp)
-        elif event_name == "EmergencyWithdrawn":
-            await self._handle_emergency_withdraw(args.poolId, args.user.lower(), args.amount)
-        elif event_name == "RewardClaimed":
-            await self._handle_reward_claimed(args.poolId, args.user.lower())
+        if len(records) >= COPY_THRESHOLD and self.db.bind.dialect.driver == "asyncpg":
+            # COPY skips the Uint256 bind processing, so hand asyncpg Decimals
+            conn = await self.db.connection()
+            raw = await conn.get_raw_connection()
+            await raw.driver_connection.copy_records_to_table(
+                StakingEvent.__tablename__,
+                records=[
+                    (
+                        chain, int(event_type), tx_hash, block_number, log_index,
+                        pool_id, user_address,
+                        None if amount is None else Decimal(amount),
+                        None if reward_amount is None else Decimal(reward_amount),
+                        timestamp,
+                    )
+                    for (
+                        chain, event_type, tx_hash, block_number, log_index,
+                        pool_id, user_address, amount, reward_amount, timestamp,
+                    ) in records
+                ],
+                columns=EVENT_COLUMNS,
+            )
+        else:
+            await self.db.execute(
+                insert(StakingEvent),
+                [dict(zip(EVENT_COLUMNS, record)) for record in records]
+            )
     
-    async def _handle_stake(self, pool_id: int, user: str, amount: int, timestamp: datetime):
-        """Handle Staked event."""
+    async def _refresh_pool_cache(self, pool_ids):
+        """Load pools missing from the in-process pool cache."""
+        missing = [pool_id for pool_id in pool_ids if pool_id not in self._pool_cache]
+        if not missing:
+            return
+        
         result = await self.db.execute(
+            select(Pool.pool_id, Pool.id, Pool.lock_duration).where(
+                Pool.chain == self.chain,
+                Pool.pool_id.in_(missing)
+            )
+        )
+        for pool_id, pk_id, lock_duration in result:
+            self._pool_cache[pool_id] = (pk_id, lock_duration)
+    
+    async def _load_stakes(
+        self,
+        keys: List[Tuple[int, str]]
+    ) -> Dict[Tuple[int, str], Stake]:
+        """Load the stakes touched by a batch with one SELECT."""
+        if not keys:
+            return {}
+        
+        stake_result = await self.db.execute(
             select(Stake).where(
                 Stake.chain == self.chain,
-                Stake.pool_id == pool_id,
-                Stake.user_address == user
+                tuple_(Stake.onchain_pool_id, Stake.user_address).in_(keys)
             )
         )
-        stake = result.scalar_one_or_none()
+        return {
+            (stake.onchain_pool_id, stake.user_address): stake
+            for stake in stake_result.scalars()
+        }
+    
+    async def _add_stake(
+        self,
+        pool: Optional[Tuple[int, int]],
+        pool_id: int,
+        user: str,
+        events: List
+    ):
+        """Add a position's Staked events to its Stake row in one upsert."""
+        amount = sum(event.args.amount for event, _ in events)
+        timestamp = events[-1][1]
         
-        # Get pool for lock duration
-        pool_result = await self.db.execute(
-            select(Pool).where(Pool.chain == self.chain, Pool.pool_id == pool_id)
+        if not pool:
+            # Without the pool's row id a new Stake cannot be inserted, so
+            # only an existing one is updated
+            await self.db.execute(
+                update(Stake)
+                .where(
+                    Stake.chain == self.chain,
+                    Stake.onchain_pool_id == pool_id,
+                    Stake.user_address == user
+                )
+                .values(
+                    staked_amount=Stake.staked_amount + amount,
+                    last_stake_time=timestamp,
+                    unlock_time=timestamp + timedelta(days=7),
+                    is_active=True
+                )
+                .execution_options(synchronize_session=False)
+            )
+            return
+        
+        stmt = pg_insert(Stake).values(
+            chain=self.chain,
+            pool_id=pool[0],
+            onchain_pool_id=pool_id,
+            user_address=user,
+            staked_amount=amount,
+            pending_rewards=0,
+            last_stake_time=timestamp,
+            unlock_time=timestamp + timedelta(seconds=pool[1]),
+            is_active=True
         )
-        pool = pool_result.scalar_one_or_none()
-        lock_duration = timedelta(seconds=pool.lock_duration) if pool else timedelta(days=7)
+        await self.db.execute(stmt.on_conflict_do_update(
+            constraint="uq_stake_chain_pool_user",
+            set_={
+                "staked_amount": Stake.staked_amount + stmt.excluded.staked_amount,
+                "last_stake_time": stmt.excluded.last_stake_time,
+                "unlock_time": stmt.excluded.unlock_time,
+                "is_active": True,
+            }
+        ))
+    
+    def _apply_stake_events(
+        self,
+        pool: Optional[Tuple[int, int]],
+        stake: Optional[Stake],
+        pool_id: int,
+        user: str,
+        events: List
+    ) -> Optional[Stake]:
+        """Apply a position's events, in order, to its Stake row."""
+        for event, timestamp in events:
+            event_name = event.event
+            if event_name == "Staked":
+                stake = self._handle_stake(pool, stake, pool_id, user, event.args.amount, timestamp)
+            elif event_name == "Withdrawn":
+                self._handle_withdraw(stake, event.args.amount)
+            elif event_name == "EmergencyWithdrawn":
+                self._handle_emergency_withdraw(stake)
+            elif event_name == "RewardClaimed":
+                self._handle_reward_claimed(stake)
+        return stake
+    
+    def _handle_stake(
+        self,
+        pool: Optional[Tuple[int, int]],
+        stake: Optional[Stake],
+        pool_id: int,
+        user: str,
+        amount: int,
+        timestamp: datetime
+    ) -> Optional[Stake]:
+        """Handle Staked event."""
+        lock_duration = timedelta(seconds=pool[1]) if pool else timedelta(days=7)
         
         if stake:
-            stake.staked_amount = str(int(stake.staked_amount) + amount)
+            stake.staked_amount = stake.staked_amount + amount
             stake.last_stake_time = timestamp
             stake.unlock_time = timestamp + lock_duration
             stake.is_active = True
-        else:
-            # Get or create pool reference
-            pool_ref_result = await self.db.execute(
-                select(Pool.id).where(Pool.chain == self.chain, Pool.pool_id == pool_id)
+        elif pool:
+            stake = Stake(
+                chain=self.chain,
+                pool_id=pool[0],
+                onchain_pool_id=pool_id,
+                user_address=user,
+                staked_amount=amount,
+                last_stake_time=timestamp,
+                unlock_time=timestamp + lock_duration,
+                is_active=True
             )
-            pool_ref_id = pool_ref_result.scalar()
-            
-            if pool_ref_id:
-                stake = Stake(
-                    chain=self.chain,
-                    pool_id=pool_ref_id,
-                    user_address=user,
-                    staked_amount=str(amount),
-                    last_stake_time=timestamp,
-                    unlock_time=timestamp + lock_duration,
-                    is_active=True
-                )
-                self.db.add(stake)
+            self.db.add(stake)
+        return stake
     
-    async def _handle_withdraw(self, pool_id: int, user: str, amount: int, timestamp: datetime):
+    def _handle_withdraw(self, stake: Optional[Stake], amount: int):
         """Handle Withdrawn event."""
-        result = await self.db.execute(
-            select(Stake).where(
-                Stake.chain == self.chain,
-                Stake.pool_id == pool_id,
-                Stake.user_address == user
-            )
-        )
-        stake = result.scalar_one_or_none()
-        
         if stake:
-            new_amount = int(stake.staked_amount) - amount
+            new_amount = stake.staked_amount - amount
             if new_amount <= 0:
-                stake.staked_amount = "0"
-                stake.pending_rewards = "0"
+                stake.staked_amount = 0
+                stake.pending_rewards = 0
                 stake.is_active = False
             else:
-                stake.staked_amount = str(new_amount)
-                stake.pending_rewards = "0"
+                stake.staked_amount = new_amount
+                stake.pending_rewards = 0
     
-    async def _handle_emergency_withdraw(self, pool_id: int, user: str, amount: int):
+    def _handle_emergency_withdraw(self, stake: Optional[Stake]):
         """Handle EmergencyWithdrawn event."""
-        result = await self.db.execute(
-            select(Stake).where(
-                Stake.chain == self.chain,
-                Stake.pool_id == pool_id,
-                Stake.user_address == user
-            )
-        )
-        stake = result.scalar_one_or_none()
-        
         if stake:
-            stake.staked_amount = "0"
-            stake.pending_rewards = "0"
+            stake.staked_amount = 0
+            stake.pending_rewards = 0
             stake.is_active = False
     
-    async def _handle_reward_claimed(self, pool_id: int, user: str):
+    def _handle_reward_claimed(self, stake: Optional[Stake]):
         """Handle RewardClaimed event."""
-        result = await self.db.execute(
-            select(Stake).where(
-                Stake.chain == self.chain,
-                Stake.pool_id == pool_id,
-                Stake.user_address == user
-            )
-        )
-        stake = result.scalar_one_or_none()
-        
         if stake:
-            stake.pending_rewards = "0"
+            stake.pending_rewards = 0
     
     async def sync_pools(self):
         """Sync pool information from blockchain."""
-        pool_count = self.blockchain.get_pool_count()
+        pool_count = await self.blockchain.get_pool_count()
+        pools = []
         
-        for pool_id in range(pool_count):
-            pool_info = self.blockchain.get_pool_info(pool_id)
-            if not pool_info:
-                continue
+        for pool_info in await self.blockchain.get_all_pools_info(pool_count):
+            pool_id = pool_info.pool_id
             
             result = await self.db.execute(
                 select(Pool).where(
@@ -235,7 +435,7 @@ class IndexerService:
                 # Update existing
                 pool.staking_token = pool_info.staking_token
                 pool.reward_token = pool_info.reward_token
-                pool.reward_rate = str(pool_info.reward_rate)
+                pool.reward_rate = int(pool_info.reward_rate)
                 pool.lock_duration = pool_info.lock_duration
                 pool.deposit_fee = pool_info.deposit_fee
                 pool.withdraw_fee = pool_info.withdraw_fee
@@ -247,15 +447,17 @@ class IndexerService:
                     pool_id=pool_id,
                     staking_token=pool_info.staking_token,
                     reward_token=pool_info.reward_token,
-                    reward_rate=str(pool_info.reward_rate),
+                    reward_rate=pool_info.reward_rate,
                     lock_duration=pool_info.lock_duration,
                     deposit_fee=pool_info.deposit_fee,
                     withdraw_fee=pool_info.withdraw_fee,
                     is_active=pool_info.is_active
                 )
                 self.db.add(pool)
+            pools.append(pool)
         
         await self.db.commit()
+        self._pool_cache = {pool.pool_id: (pool.id, pool.lock_duration) for pool in pools}
         logger.info(f"Synced {pool_count} pools for {self.chain}")
     
     async def run(self):
@@ -267,6 +469,7 @@ class IndexerService:
         settings = get_settings()
         
         while not self._stop_event.is_set():
+            catching_up = False
             try:
                 # Get current state
                 result = await self.db.execute(
@@ -274,7 +477,7 @@ class IndexerService:
                 )
                 state = result.scalar_one()
                 
-                current_block = self.blockchain.get_block_number()
+                current_block = await self.blockchain.get_block_number()
                 last_block = state.last_block_number
                 
                 if current_block > last_block:
@@ -287,20 +490,71 @@ class IndexerService:
                         last_block + settings.INDEXER_BATCH_SIZE
                     )
                     
-                    await self.index_block_range(last_block + 1, to_block)
+                    # Far behind head: split the batch's log fetch across
+                    # concurrent sub-ranges and skip the poll wait
+                    catching_up = to_block < current_block - 1
+                    sub_ranges = settings.INDEXER_CATCHUP_CONCURRENCY if catching_up else 1
+                    
+                    batch = await self._take_prefetch(last_block + 1, to_block)
+                    if catching_up:
+                        # Fetch and decode the next batch while this one is written
+                        next_range = (
+                            to_block + 1,
+                            min(current_block - 1, to_block + settings.INDEXER_BATCH_SIZE)
+                        )
+                        self._prefetch = (
+                            next_range,
+                            asyncio.create_task(self._fetch_batch(*next_range, sub_ranges))
+                        )
+                    await self.index_block_range(last_block + 1, to_block, sub_ranges, batch)
                 
-                # Wait before next poll
-                await asyncio.wait_for(
-                    self._stop_event.wait(),
-                    timeout=settings.INDEXER_POLL_INTERVAL
-                )
+                self._backoff = MIN_BACKOFF
                 
-            except asyncio.TimeoutError:
-                continue
             except Exception as e:
-                logger.error(f"Indexer error: {e}")
-                await self.db.rollback()
-                await asyncio.sleep(5)
+                # Back off and retry rather than letting one bad batch or
+                # transient fault kill the task for the life of the process
+                if isinstance(e, NETWORK_ERRORS):
+                    logger.warning(f"Indexer network error, retrying in {self._backoff}s: {e}")
+                else:
+                    logger.exception(f"Indexer error, retrying in {self._backoff}s: {e}")
+                self._cancel_prefetch()
+                try:
+                    await self.db.rollback()
+                except Exception as rollback_error:
+                    logger.warning(f"Indexer rollback failed: {rollback_error}")
+                await self._wait(self._backoff)
+                self._backoff = min(self._backoff * 2, MAX_BACKOFF)
+                continue
+            
+            # Wait before next poll
+            if not catching_up:
+                await self._wait(settings.INDEXER_POLL_INTERVAL)
+        
+        self._cancel_prefetch()
+    
+    async def _take_prefetch(self, from_block: int, to_block: int) -> Optional[Tuple[List[tuple], Dict]]:
+        """Return the prefetched batch if it covers exactly this range."""
+        if self._prefetch is None:
+            return None
+        block_range, task = self._prefetch
+        self._prefetch = None
+        if block_range != (from_block, to_block):
+            task.cancel()
+            return None
+        return await task
+    
+    def _cancel_prefetch(self):
+        """Drop any in-flight prefetch."""
+        if self._prefetch is not None:
+            self._prefetch[1].cancel()
+            self._prefetch = None
+    
+    async def _wait(self, timeout: float):
+        """Sleep for up to ``timeout`` seconds, waking early on stop."""
+        try:
+            await asyncio.wait_for(self._stop_event.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
     
     def stop(self):
         """Stop the indexer."""
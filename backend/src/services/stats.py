@@ -0,0 +1,268 @@
+"""
+Background aggregation of protocol statistics.
+"""
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from src.core.config import get_settings
+from src.models.database import (
+    Pool, Stake, StakingEvent, DailyStats, ProtocolStatsSnapshot, EventType,
+    async_session
+)
+
+logger = logging.getLogger(__name__)
+
+REWARD_EVENTS = [EventType.WITHDRAWN, EventType.REWARD_CLAIMED]
+WITHDRAW_EVENTS = [EventType.WITHDRAWN, EventType.EMERGENCY_WITHDRAWN]
+
+
+async def sum_uint256(db: AsyncSession, column, *criteria) -> int:
+    """
+    Sum a Uint256 column exactly.
+
+    Postgres sums NUMERIC(78, 0) exactly. Other dialects store Uint256 as
+    text and SUM would go through a float, so the values are added in Python.
+    """
+    if db.bind.dialect.name == "postgresql":
+        total = await db.scalar(select(func.sum(column)).where(*criteria))
+        return int(total or 0)
+    result = await db.execute(select(column).where(*criteria))
+    return sum(value for value in result.scalars() if value)
+
+
+async def compute_protocol_stats(db: AsyncSession, chain: str) -> Dict:
+    """Compute live protocol aggregates for a chain."""
+    active_stakes = (Stake.chain == chain, Stake.is_active.is_(True))
+    reward_events = (
+        StakingEvent.chain == chain,
+        StakingEvent.event_type.in_(REWARD_EVENTS),
+    )
+
+    # Each aggregate is a scalar subquery so they come back in one round trip
+    total_pools_q = (
+        select(func.count(Pool.id))
+        .where(Pool.chain == chain)
+        .scalar_subquery()
+    )
+    total_stakers_q = (
+        select(func.count(func.distinct(Stake.user_address)))
+        .where(*active_stakes)
+        .scalar_subquery()
+    )
+
+    if db.bind.dialect.name != "postgresql":
+        result = await db.execute(select(total_pools_q, total_stakers_q))
+        total_pools, total_stakers = result.one()
+        return {
+            "total_pools": total_pools or 0,
+            "total_stakers": total_stakers or 0,
+            "total_staked": await sum_uint256(db, Stake.staked_amount, *active_stakes),
+            "total_rewards": await sum_uint256(db, StakingEvent.reward_amount, *reward_events),
+        }
+
+    total_staked_q = (
+        select(func.sum(Stake.staked_amount))
+        .where(*active_stakes)
+        .scalar_subquery()
+    )
+    total_rewards_q = (
+        select(func.sum(StakingEvent.reward_amount))
+        .where(*reward_events)
+        .scalar_subquery()
+    )
+
+    result = await db.execute(
+        select(total_pools_q, total_stakers_q, total_staked_q, total_rewards_q)
+    )
+    total_pools, total_stakers, total_staked, total_rewards = result.one()
+
+    return {
+        "total_pools": total_pools or 0,
+        "total_stakers": total_stakers or 0,
+        "total_staked": int(total_staked or 0),
+        "total_rewards": int(total_rewards or 0),
+    }
+
+
+def _upsert(db: AsyncSession, model, values: Dict, index_elements: List[str], update: List[str]):
+    """
+    Build an INSERT that updates ``update`` columns on a unique-key conflict.
+
+    Several workers may refresh the same chain at once, so rows are never
+    written with a select-then-insert.
+    """
+    insert = pg_insert if db.bind.dialect.name == "postgresql" else sqlite_insert
+    stmt = insert(model).values(**values)
+    return stmt.on_conflict_do_update(
+        index_elements=index_elements,
+        set_={column: stmt.excluded[column] for column in update}
+    )
+
+
+async def refresh_protocol_stats(db: AsyncSession, chain: str) -> Dict:
+    """Recompute and store the protocol stats snapshot for a chain."""
+    stats = await compute_protocol_stats(db, chain)
+    values = {**stats, "updated_at": datetime.utcnow()}
+    await db.execute(_upsert(
+        db, ProtocolStatsSnapshot, {"chain": chain, **values},
+        index_elements=["chain"], update=list(values)
+    ))
+    return stats
+
+
+def _start_of_day(timestamp: datetime) -> datetime:
+    return timestamp.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def _days(start: datetime, end: datetime) -> List[datetime]:
+    """Midnights from ``start`` up to but excluding ``end``."""
+    days = []
+    while start < end:
+        days.append(start)
+        start += timedelta(days=1)
+    return days
+
+
+async def rollup_daily_stats(
+    db: AsyncSession,
+    chain: str,
+    day: datetime,
+    stats: Optional[Dict] = None
+):
+    """
+    Roll a day's events into its DailyStats row.
+
+    Point-in-time totals are copied from ``stats`` when given; a day being
+    finalized keeps the totals recorded on its last refresh.
+    """
+    start = _start_of_day(day)
+    end = start + timedelta(days=1)
+    in_day = (
+        StakingEvent.chain == chain,
+        StakingEvent.timestamp >= start,
+        StakingEvent.timestamp < end,
+    )
+
+    result = await db.execute(
+        select(
+            func.count(StakingEvent.id)
+            .filter(StakingEvent.event_type == EventType.STAKED),
+            func.count(StakingEvent.id)
+            .filter(StakingEvent.event_type.in_(WITHDRAW_EVENTS)),
+        ).where(*in_day)
+    )
+    new_stakes, withdrawals = result.one()
+    rewards = await sum_uint256(
+        db, StakingEvent.reward_amount,
+        *in_day, StakingEvent.event_type.in_(REWARD_EVENTS)
+    )
+
+    values = {
+        "total_rewards_distributed": rewards,
+        "new_stakes": new_stakes or 0,
+        "withdrawals": withdrawals or 0,
+    }
+    if stats:
+        values["total_staked"] = stats["total_staked"]
+        values["unique_stakers"] = stats["total_stakers"]
+    await db.execute(_upsert(
+        db, DailyStats, {"chain": chain, "date": start, **values},
+        index_elements=["chain", "date"], update=list(values)
+    ))
+
+
+async def _past_days_to_roll_up(
+    db: AsyncSession,
+    chain: str,
+    after_event_id: int,
+    today: datetime
+) -> Tuple[List[datetime], int]:
+    """
+    Return the past days whose DailyStats rows need recomputing, and the
+    id of the newest event seen.
+
+    These are the days from the last stored rollup up to today, which
+    finalizes it and fills outage gaps, and every day on which events
+    indexed after ``after_event_id`` fall, including backfilled ones.
+    """
+    result = await db.execute(
+        select(
+            func.min(StakingEvent.timestamp),
+            func.max(StakingEvent.timestamp),
+            func.max(StakingEvent.id),
+        ).where(StakingEvent.chain == chain, StakingEvent.id > after_event_id)
+    )
+    first_new, last_new, last_event_id = result.one()
+    last_day = await db.scalar(
+        select(func.max(DailyStats.date)).where(DailyStats.chain == chain)
+    )
+
+    days = set()
+    if first_new:
+        end = min(_start_of_day(last_new) + timedelta(days=1), today)
+        days.update(_days(_start_of_day(first_new), end))
+    if last_day:
+        days.update(_days(last_day, today))
+    return sorted(days), last_event_id or after_event_id
+
+
+async def aggregate_chain_stats(
+    db: AsyncSession,
+    chain: str,
+    now: datetime,
+    after_event_id: int = 0
+) -> int:
+    """
+    Refresh a chain's snapshot and today's rollup, and roll up the past
+    days that need it.
+
+    Returns the newest event id seen, to pass as ``after_event_id`` on the
+    next run. With the default of 0 every day with events is rolled up.
+    """
+    days, last_event_id = await _past_days_to_roll_up(
+        db, chain, after_event_id, _start_of_day(now)
+    )
+    # Past days keep the totals recorded on their last refresh
+    for day in days:
+        await rollup_daily_stats(db, chain, day)
+    stats = await refresh_protocol_stats(db, chain)
+    await rollup_daily_stats(db, chain, now, stats)
+    return last_event_id
+
+
+async def run_stats_aggregator(stop_event: asyncio.Event):
+    """Periodically refresh stats snapshots and daily rollups for every chain."""
+    settings = get_settings()
+    # Newest event id already rolled up, per chain. A restart starts from 0
+    # and so rebuilds every day's row once.
+    last_event_ids: Dict[str, int] = {}
+
+    while not stop_event.is_set():
+        try:
+            async with async_session() as db:
+                now = datetime.utcnow()
+                seen = {}
+                chains = (await db.execute(select(Pool.chain).distinct())).scalars().all()
+                for chain in chains:
+                    seen[chain] = await aggregate_chain_stats(
+                        db, chain, now, last_event_ids.get(chain, 0)
+                    )
+                await db.commit()
+            last_event_ids.update(seen)
+        except Exception as e:
+            logger.error(f"Stats aggregation error: {e}")
+
+        try:
+            await asyncio.wait_for(
+                stop_event.wait(),
+                timeout=settings.STATS_REFRESH_INTERVAL
+            )
+        except asyncio.TimeoutError:
+            continue
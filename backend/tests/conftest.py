@@ -0,0 +1,86 @@
+"""
+Shared fixtures for the StakeFlow backend tests.
+"""
+import pytest
+from eth_utils import event_abi_to_log_topic
+from faster_eth_abi.abi import encode
+from hexbytes import HexBytes
+from httpx import ASGITransport, AsyncClient
+from fastapi import FastAPI
+from web3 import Web3
+from web3.datastructures import AttributeDict
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from src.api.routes import router
+from src.core.config import Settings
+from src.models.database import Base, get_db, get_stream_session
+from src.services.blockchain import STAKING_CONTRACT_ABI, BlockchainService
+
+STAKING_CONTRACT = "0x" + "5" * 40
+EVENT_ABIS = {abi["name"]: abi for abi in STAKING_CONTRACT_ABI if abi["type"] == "event"}
+
+
+def make_log(event: str, args: dict, block_number: int = 1234, log_index: int = 3):
+    """Build a raw eth_getLogs entry for a staking contract event."""
+    abi = EVENT_ABIS[event]
+    indexed = [arg for arg in abi["inputs"] if arg["indexed"]]
+    data = [arg for arg in abi["inputs"] if not arg["indexed"]]
+    return AttributeDict({
+        "address": Web3.to_checksum_address(STAKING_CONTRACT),
+        "topics": [HexBytes(event_abi_to_log_topic(abi))] + [
+            HexBytes(encode([arg["type"]], [args[arg["name"]]])) for arg in indexed
+        ],
+        "data": HexBytes(encode(
+            [arg["type"] for arg in data], [args[arg["name"]] for arg in data]
+        )),
+        "logIndex": log_index,
+        "transactionIndex": 1,
+        "transactionHash": HexBytes(block_number.to_bytes(32, "big")),
+        "blockHash": HexBytes("0x" + "ef" * 32),
+        "blockNumber": block_number,
+    })
+
+
+@pytest.fixture
+async def session_factory():
+    """In-memory SQLite database with the full schema."""
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield async_sessionmaker(engine, expire_on_commit=False)
+    await engine.dispose()
+
+
+@pytest.fixture
+async def db(session_factory):
+    async with session_factory() as session:
+        yield session
+
+
+@pytest.fixture
+async def client(session_factory):
+    """API client whose requests use the test database."""
+    async def override_get_db():
+        async with session_factory() as session:
+            yield session
+            await session.commit()
+
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_stream_session] = lambda: session_factory()
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        yield ac
+
+
+@pytest.fixture
+def blockchain(monkeypatch):
+    """Sepolia BlockchainService with placeholder config; it makes no RPC calls."""
+    monkeypatch.setattr(Settings, "get_chain_config", lambda self, chain: {
+        "rpc_url": "http://127.0.0.1:1",
+        "chain_id": 11155111,
+        "staking_contract": STAKING_CONTRACT,
+        "reward_token": "0x" + "6" * 40,
+    })
+    return BlockchainService("sepolia")
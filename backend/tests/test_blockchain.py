@@ -0,0 +1,40 @@
+"""
+Tests for the blockchain service's log decoding.
+"""
+import pytest
+from faster_eth_abi.abi import default_codec as abi_codec
+from web3 import Web3
+from web3._utils.events import get_event_data
+
+from conftest import EVENT_ABIS, make_log
+
+USER = Web3.to_checksum_address("0x" + "ab" * 20)
+
+
+def _log(abi):
+    """Build a log with every argument set, uint256 values above 2**64."""
+    return make_log(abi["name"], {
+        arg["name"]: USER if arg["type"] == "address" else 2**200 + i
+        for i, arg in enumerate(abi["inputs"])
+    })
+
+
+@pytest.mark.parametrize("abi", EVENT_ABIS.values(), ids=list(EVENT_ABIS))
+def test_fast_decode_matches_get_event_data(blockchain, abi):
+    log = _log(abi)
+
+    fast = blockchain.decode_log(log)
+    expected = get_event_data(abi_codec, abi, log)
+
+    assert fast == expected
+    assert fast.args == expected.args
+    assert fast.args["user"] == USER
+    assert all(type(fast.args[name]) is type(value) for name, value in expected.args.items())
+
+
+def test_decode_logs_dispatches_on_topic0(blockchain):
+    logs = [_log(abi) for abi in EVENT_ABIS.values()]
+
+    events = blockchain.decode_logs(logs)
+
+    assert [event.event for event in events] == list(EVENT_ABIS)
@@ -0,0 +1,35 @@
+"""
+Tests for the Redis cache's behaviour while Redis is unreachable.
+"""
+import logging
+
+import pytest
+import redis.asyncio as redis
+
+from src.services import cache
+
+
+@pytest.fixture
+def unreachable_redis(monkeypatch):
+    client = redis.from_url("redis://127.0.0.1:1/0", socket_connect_timeout=0.25)
+    monkeypatch.setattr(cache, "_client", client)
+    monkeypatch.setattr(cache, "_down_until", 0.0)
+    yield client
+
+
+async def test_cache_is_bypassed_and_warned_once_while_down(unreachable_redis, caplog):
+    calls = []
+
+    @cache.cached("answer:{n}", ttl=60)
+    async def answer(n):
+        calls.append(n)
+        return n * 2
+
+    with caplog.at_level(logging.WARNING, logger=cache.__name__):
+        assert await answer(1) == 2
+        assert await answer(2) == 4
+        await cache.invalidate("answer:1")
+
+    assert calls == [1, 2]
+    assert len(caplog.records) == 1
+    assert not cache._available()
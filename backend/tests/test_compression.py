@@ -0,0 +1,123 @@
+"""
+Tests for Accept-Encoding negotiation and the compression middleware.
+"""
+import gzip
+import zlib
+
+import brotli
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
+from httpx import ASGITransport, AsyncClient
+
+from src.api.compression import CompressionMiddleware, negotiate_encoding
+
+BODY = b"stakeflow " * 200
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("", None),
+    ("identity", None),
+    ("gzip", "gzip"),
+    ("gzip, br", "br"),
+    ("br;q=0.1, gzip;q=1.0", "gzip"),
+    ("br;q=0.8, gzip;q=0.8", "br"),
+    ("BR;Q=0.5, GZIP;q=0.4", "br"),
+    ("br;q=0, gzip", "gzip"),
+    ("br;q=0, gzip;q=0", None),
+    ("*", "br"),
+    ("gzip;q=0.5, *;q=0.1", "gzip"),
+    ("*;q=0.5, br;q=0", "gzip"),
+    ("*;q=0", None),
+    ("br;q=oops, gzip", "gzip"),
+])
+def test_negotiate_encoding_ranks_by_quality(header, expected):
+    assert negotiate_encoding(header) == expected
+
+
+def _app():
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=500)
+
+    @app.get("/large")
+    async def large():
+        return PlainTextResponse(BODY)
+
+    @app.get("/small")
+    async def small():
+        return PlainTextResponse(b"tiny")
+
+    @app.get("/encoded")
+    async def encoded():
+        return Response(
+            gzip.compress(BODY), media_type="text/plain",
+            headers={"Content-Encoding": "gzip"}
+        )
+
+    @app.get("/stream")
+    async def stream():
+        async def chunks():
+            for i in range(5):
+                yield b"chunk %d " % i * 50
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    return app
+
+
+async def _get_raw(path, accept_encoding):
+    """GET a path and return the response with its undecoded body."""
+    transport = ASGITransport(app=_app())
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        async with client.stream(
+            "GET", path, headers={"Accept-Encoding": accept_encoding}
+        ) as response:
+            raw = b"".join([chunk async for chunk in response.aiter_raw()])
+    return response, raw
+
+
+@pytest.mark.parametrize("encoding, decompress", [
+    ("br", brotli.decompress),
+    ("gzip", gzip.decompress),
+])
+async def test_large_body_is_compressed(encoding, decompress):
+    response, raw = await _get_raw("/large", encoding)
+
+    assert response.headers["content-encoding"] == encoding
+    assert response.headers["content-length"] == str(len(raw))
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert decompress(raw) == BODY
+
+
+async def test_small_body_passes_through():
+    response, raw = await _get_raw("/small", "br, gzip")
+
+    assert "content-encoding" not in response.headers
+    assert raw == b"tiny"
+
+
+async def test_already_encoded_body_passes_through():
+    response, raw = await _get_raw("/encoded", "br")
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert gzip.decompress(raw) == BODY
+
+
+async def test_no_accepted_encoding_passes_through():
+    response, raw = await _get_raw("/large", "identity")
+
+    assert "content-encoding" not in response.headers
+    assert raw == BODY
+
+
+@pytest.mark.parametrize("encoding", ["br", "gzip"])
+async def test_streamed_body_round_trips(encoding):
+    expected = b"".join(b"chunk %d " % i * 50 for i in range(5))
+
+    response, raw = await _get_raw("/stream", encoding)
+
+    assert response.headers["content-encoding"] == encoding
+    assert "content-length" not in response.headers
+    if encoding == "br":
+        assert brotli.decompress(raw) == expected
+    else:
+        assert zlib.decompress(raw, 31) == expected
@@ -0,0 +1,293 @@
+"""
+Tests for the indexer's batch write path against a stubbed chain.
+"""
+import asyncio
+from datetime import datetime, timedelta
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+from web3 import Web3
+from web3.datastructures import AttributeDict
+
+from src.models.database import EventType, IndexerState, Pool, Stake, StakingEvent
+from src.services import indexer as indexer_module
+from src.services.indexer import COPY_THRESHOLD, EVENT_COLUMNS, IndexerService
+
+from conftest import make_log
+
+ALICE = Web3.to_checksum_address("0x" + "a1" * 20)
+BOB = Web3.to_checksum_address("0x" + "b0" * 20)
+LARGE = 4 * 10**25 + 1
+BLOCK_TIME = datetime(2024, 3, 1, 12)
+
+
+class StubBlockchain:
+    """Serves fixed logs and block timestamps; decoding uses the real service."""
+
+    def __init__(self, service, logs):
+        self._service = service
+        self.logs = logs
+        self.block_number = max(log["blockNumber"] for log in logs) + 1
+
+    async def get_all_logs(self, from_block, to_block):
+        return [log for log in self.logs if from_block <= log["blockNumber"] <= to_block]
+
+    async def get_all_logs_chunked(self, from_block, to_block, chunk_size, concurrency):
+        return await self.get_all_logs(from_block, to_block)
+
+    def decode_logs(self, logs):
+        return self._service.decode_logs(logs)
+
+    async def get_blocks(self, block_numbers):
+        return {
+            number: AttributeDict({"timestamp": int((BLOCK_TIME + timedelta(seconds=number)).timestamp())})
+            for number in block_numbers
+        }
+
+    async def get_block_number(self):
+        return self.block_number
+
+
+def _staking_log(event, user, pool_id, block, log_index=0, **data):
+    return make_log(event, {"user": user, "poolId": pool_id, "timestamp": 0, **data}, block, log_index)
+
+
+LOGS = [
+    _staking_log("Staked", ALICE, 0, 10, amount=LARGE),
+    _staking_log("Staked", BOB, 0, 10, 1, amount=10),
+    _staking_log("Staked", ALICE, 0, 11, amount=50),
+    _staking_log("EmergencyWithdrawn", BOB, 0, 11, 1, amount=10, penalty=1),
+    _staking_log("Withdrawn", ALICE, 0, 12, amount=30, rewardAmount=7),
+    _staking_log("RewardClaimed", ALICE, 1, 12, 1, rewardAmount=5),
+]
+
+
+@pytest.fixture
+def invalidated(monkeypatch):
+    keys = []
+
+    async def record(*args):
+        keys.extend(args)
+
+    monkeypatch.setattr(indexer_module, "invalidate", record)
+    return keys
+
+
+@pytest.fixture
+async def indexer(db, blockchain, monkeypatch, invalidated):
+    stub = StubBlockchain(blockchain, LOGS)
+    monkeypatch.setattr(indexer_module, "get_blockchain_service", lambda chain: stub)
+    db.add_all([
+        Pool(chain="sepolia", pool_id=0, staking_token="0x" + "1" * 40,
+             reward_token="0x" + "2" * 40, lock_duration=3600),
+        Pool(chain="sepolia", pool_id=1, staking_token="0x" + "1" * 40,
+             reward_token="0x" + "2" * 40, lock_duration=0),
+    ])
+    await db.flush()
+    pool_1 = (await db.execute(select(Pool).where(Pool.pool_id == 1))).scalar_one()
+    db.add(Stake(
+        chain="sepolia", pool_id=pool_1.id, onchain_pool_id=1,
+        user_address=ALICE.lower(), staked_amount=100, pending_rewards=5
+    ))
+    await db.commit()
+
+    service = IndexerService("sepolia", db)
+    await service.initialize()
+    return service
+
+
+async def _stakes(db):
+    result = await db.execute(
+        select(Stake).execution_options(populate_existing=True)
+    )
+    return {(stake.onchain_pool_id, stake.user_address): stake for stake in result.scalars()}
+
+
+async def _check_indexed(db):
+    events = (await db.execute(
+        select(StakingEvent).order_by(StakingEvent.block_number, StakingEvent.log_index)
+    )).scalars().all()
+    assert [(event.block_number, event.log_index, event.event_type) for event in events] == [
+        (10, 0, EventType.STAKED),
+        (10, 1, EventType.STAKED),
+        (11, 0, EventType.STAKED),
+        (11, 1, EventType.EMERGENCY_WITHDRAWN),
+        (12, 0, EventType.WITHDRAWN),
+        (12, 1, EventType.REWARD_CLAIMED),
+    ]
+    assert events[0].amount == LARGE
+    assert events[0].user_address == ALICE.lower()
+    assert events[0].timestamp == BLOCK_TIME + timedelta(seconds=10)
+    assert events[4].reward_amount == 7
+    assert events[5].amount is None
+
+    stakes = await _stakes(db)
+    alice = stakes[(0, ALICE.lower())]
+    assert alice.staked_amount == LARGE + 50 - 30
+    assert alice.is_active
+    assert alice.last_stake_time == BLOCK_TIME + timedelta(seconds=11)
+    assert alice.unlock_time == alice.last_stake_time + timedelta(hours=1)
+    bob = stakes[(0, BOB.lower())]
+    assert bob.staked_amount == 0
+    assert not bob.is_active
+    claimed = stakes[(1, ALICE.lower())]
+    assert claimed.staked_amount == 100
+    assert claimed.pending_rewards == 0
+
+    state = (await db.execute(
+        select(IndexerState).execution_options(populate_existing=True)
+    )).scalar_one()
+    assert state.last_block_number == 12
+
+
+async def test_index_block_range_writes_events_and_applies_stakes_in_order(
+    db, indexer, invalidated
+):
+    await indexer.index_block_range(10, 12)
+
+    await _check_indexed(db)
+    assert sorted(invalidated) == ["pool_info:sepolia:0", "pool_info:sepolia:1"]
+
+
+async def test_index_block_range_uses_a_prefetched_batch(db, indexer):
+    batch = await indexer._fetch_batch(10, 12, sub_ranges=2)
+    indexer.blockchain.logs = []
+
+    await indexer.index_block_range(10, 12, batch=batch)
+
+    await _check_indexed(db)
+
+
+async def test_failed_batch_is_rolled_back(db, indexer, monkeypatch):
+    async def fail(records):
+        raise ValueError("bad batch")
+
+    monkeypatch.setattr(indexer, "_write_events", fail)
+
+    with pytest.raises(ValueError):
+        await indexer.index_block_range(10, 12)
+
+    assert (await db.execute(select(StakingEvent))).first() is None
+    state = (await db.execute(
+        select(IndexerState).execution_options(populate_existing=True)
+    )).scalar_one()
+    assert state.last_block_number == 0
+
+
+async def test_take_prefetch_cancels_a_mismatched_range(indexer):
+    task = asyncio.create_task(asyncio.sleep(10))
+    indexer._prefetch = ((10, 12), task)
+
+    assert await indexer._take_prefetch(10, 20) is None
+    await asyncio.sleep(0)
+    assert task.cancelled()
+    assert indexer._prefetch is None
+
+    indexer._prefetch = ((10, 12), asyncio.create_task(asyncio.sleep(0, "batch")))
+    assert await indexer._take_prefetch(10, 12) == "batch"
+
+
+async def test_run_survives_errors_and_cancels_prefetch_on_stop(indexer, monkeypatch):
+    prefetch = asyncio.create_task(asyncio.sleep(10))
+    indexer._prefetch = ((1, 2), prefetch)
+    calls = 0
+
+    async def get_block_number():
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            raise RuntimeError("unexpected")
+        indexer.stop()
+        return 0
+
+    monkeypatch.setattr(indexer.blockchain, "get_block_number", get_block_number)
+    monkeypatch.setattr(indexer_module, "MIN_BACKOFF", 0)
+    indexer._backoff = 0
+
+    await asyncio.wait_for(indexer.run(), timeout=5)
+
+    assert calls == 2
+    await asyncio.sleep(0)
+    assert prefetch.cancelled()
+    assert indexer._prefetch is None
+
+
+class RecordingSession:
+    """Session stand-in that records statements for dialect-specific paths."""
+
+    def __init__(self, driver="asyncpg"):
+        self.bind = SimpleNamespace(dialect=SimpleNamespace(name="postgresql", driver=driver))
+        self.executed = []
+        self.copied = []
+
+    async def execute(self, statement, params=None):
+        self.executed.append((statement, params))
+
+    async def connection(self):
+        session = self
+
+        class Connection:
+            async def get_raw_connection(self):
+                async def copy_records_to_table(table, records, columns):
+                    session.copied.append((table, records, columns))
+                return SimpleNamespace(
+                    driver_connection=SimpleNamespace(copy_records_to_table=copy_records_to_table)
+                )
+
+        return Connection()
+
+
+def _record(i, amount=LARGE):
+    return ("sepolia", EventType.STAKED, "0x%064x" % i, i, 0, 0, ALICE.lower(),
+            amount, None, BLOCK_TIME)
+
+
+@pytest.mark.parametrize("driver, count, copied", [
+    ("asyncpg", COPY_THRESHOLD, True),
+    ("asyncpg", COPY_THRESHOLD - 1, False),
+    ("psycopg", COPY_THRESHOLD, False),
+])
+async def test_write_events_uses_copy_only_for_large_asyncpg_batches(
+    indexer, driver, count, copied
+):
+    session = RecordingSession(driver)
+    indexer.db = session
+
+    await indexer._write_events([_record(i) for i in range(count)])
+
+    if copied:
+        ((table, records, columns),) = session.copied
+        assert table == StakingEvent.__tablename__
+        assert columns == EVENT_COLUMNS
+        assert len(records) == count
+        assert records[0][1] == int(EventType.STAKED)
+        assert records[0][7] == Decimal(LARGE)
+        assert session.executed == []
+    else:
+        assert session.copied == []
+        ((_, params),) = session.executed
+        assert len(params) == count
+        assert params[0]["amount"] == LARGE
+
+
+async def test_add_stake_upserts_on_the_position_constraint(indexer):
+    session = RecordingSession()
+    indexer.db = session
+    events = [
+        (SimpleNamespace(args=SimpleNamespace(amount=amount)), BLOCK_TIME + timedelta(seconds=i))
+        for i, amount in enumerate((LARGE, 5))
+    ]
+
+    await indexer._add_stake((7, 3600), 0, ALICE.lower(), events)
+
+    ((statement, _),) = session.executed
+    compiled = statement.compile(dialect=postgresql.dialect())
+    sql = str(compiled)
+    assert "ON CONFLICT ON CONSTRAINT uq_stake_chain_pool_user DO UPDATE" in sql
+    assert "staked_amount = (stakes.staked_amount + excluded.staked_amount)" in sql
+    assert compiled.params["staked_amount"] == LARGE + 5
+    assert compiled.params["last_stake_time"] == BLOCK_TIME + timedelta(seconds=1)
+    assert compiled.params["unlock_time"] == BLOCK_TIME + timedelta(seconds=3601)
@@ -0,0 +1,140 @@
+"""
+Tests for the API routes.
+"""
+from datetime import datetime
+
+import orjson
+
+from src.models.database import (
+    EventType, Pool, ProtocolStatsSnapshot, Stake, StakingEvent
+)
+
+
+async def test_chain_query_is_case_insensitive(client, db):
+    db.add(ProtocolStatsSnapshot(
+        chain="sepolia", total_staked=10**18, total_pools=2,
+        total_stakers=3, total_rewards=0
+    ))
+    await db.commit()
+
+    response = await client.get("/api/v1/stats", params={"chain": "Sepolia"})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["chain"] == "sepolia"
+    assert body["total_pools"] == 2
+    assert body["total_stakers"] == 3
+
+
+async def test_event_type_query_accepts_event_name(client):
+    response = await client.get(
+        "/api/v1/events", params={"chain": "SEPOLIA", "event_type": "Staked"}
+    )
+
+    assert response.status_code == 200
+    assert response.json() == []
+
+
+async def test_pool_stats_total_staked_is_exact(client, db):
+    pool = Pool(
+        chain="sepolia", pool_id=0, staking_token="0x" + "1" * 40,
+        reward_token="0x" + "2" * 40
+    )
+    db.add(pool)
+    await db.flush()
+    amount = 4 * 10**25 + 1
+    db.add_all([
+        Stake(
+            chain="sepolia", pool_id=pool.id, onchain_pool_id=0,
+            user_address="0x" + str(i) * 40, staked_amount=amount
+        )
+        for i in range(3)
+    ])
+    await db.commit()
+
+    response = await client.get("/api/v1/pools/0/stats", params={"chain": "sepolia"})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["unique_stakers"] == 3
+    assert body["total_staked"] == str(3 * amount)
+
+
+async def test_pools_are_listed_as_plain_payloads(client, db):
+    db.add_all([
+        Pool(
+            chain="sepolia", pool_id=0, staking_token="0x" + "1" * 40,
+            reward_token="0x" + "2" * 40, total_staked=4 * 10**25 + 1
+        ),
+        Pool(
+            chain="sepolia", pool_id=1, staking_token="0x" + "1" * 40,
+            reward_token="0x" + "2" * 40, is_active=False
+        ),
+    ])
+    await db.commit()
+
+    response = await client.get("/api/v1/pools", params={"chain": "sepolia"})
+    assert response.status_code == 200
+    (pool,) = response.json()
+    assert pool["pool_id"] == 0
+    assert pool["total_staked"] == str(4 * 10**25 + 1)
+    assert pool["apy"] is None
+
+    response = await client.get("/api/v1/pools/1", params={"chain": "sepolia"})
+    assert response.status_code == 200
+    assert response.json()["is_active"] is False
+
+
+async def test_event_stream_yields_one_json_line_per_event(client, db):
+    db.add_all([
+        StakingEvent(
+            chain="sepolia", event_type=EventType.STAKED, tx_hash="0x" + "a" * 64,
+            block_number=block, log_index=block, pool_id=0,
+            user_address="0x" + "3" * 40, amount=4 * 10**25 + block,
+            timestamp=datetime(2024, 3, 1, block)
+        )
+        for block in (1, 2, 3)
+    ])
+    await db.commit()
+
+    response = await client.get("/api/v1/events/stream", params={"chain": "Sepolia"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    events = [orjson.loads(line) for line in response.text.splitlines()]
+    assert [event["block_number"] for event in events] == [3, 2, 1]
+    assert events[0]["amount"] == str(4 * 10**25 + 3)
+    assert events[0]["event_type"] == "Staked"
+
+
+async def test_event_type_names_match_case_insensitively(client, db):
+    db.add_all([
+        StakingEvent(
+            chain="sepolia", event_type=event_type, tx_hash="0x" + "b" * 64,
+            block_number=1, log_index=log_index, pool_id=0,
+            user_address="0x" + "3" * 40, timestamp=datetime(2024, 3, 1)
+        )
+        for log_index, event_type in enumerate((EventType.STAKED, EventType.REWARD_CLAIMED))
+    ])
+    await db.commit()
+
+    for name, expected in [
+        ("staked", "Staked"), ("STAKED", "Staked"), ("2", None),
+        ("rewardclaimed", "RewardClaimed"), ("reward_claimed", "RewardClaimed"),
+    ]:
+        response = await client.get(
+            "/api/v1/events", params={"chain": "sepolia", "event_type": name}
+        )
+        assert response.status_code == 200, name
+        assert [event["event_type"] for event in response.json()] == ([expected] if expected else [])
+
+
+async def test_unknown_event_type_lists_valid_names(client):
+    response = await client.get(
+        "/api/v1/events", params={"chain": "sepolia", "event_type": "Unstaked"}
+    )
+
+    assert response.status_code == 422
+    (error,) = response.json()["detail"]
+    assert error["type"] == "value_error"
+    assert "Staked, Withdrawn, RewardClaimed, EmergencyWithdrawn" in error["msg"]
@@ -0,0 +1,156 @@
+"""
+Tests for protocol stats aggregation.
+"""
+from datetime import datetime, timedelta
+
+from sqlalchemy import select
+
+from src.models.database import (
+    DailyStats, EventType, Pool, ProtocolStatsSnapshot, Stake, StakingEvent
+)
+from src.services.stats import (
+    aggregate_chain_stats, compute_protocol_stats, refresh_protocol_stats,
+    rollup_daily_stats
+)
+
+# Above 2**53, where a float sum would lose the low digits
+LARGE = 4 * 10**25 + 1
+
+
+def _pool(chain="sepolia", pool_id=0):
+    return Pool(
+        chain=chain, pool_id=pool_id, staking_token="0x" + "1" * 40,
+        reward_token="0x" + "2" * 40
+    )
+
+
+def _event(event_type, reward_amount, timestamp, log_index):
+    return StakingEvent(
+        chain="sepolia", event_type=event_type, tx_hash="0x" + "a" * 64,
+        block_number=1, log_index=log_index, pool_id=0,
+        user_address="0x" + "3" * 40, amount=0, reward_amount=reward_amount,
+        timestamp=timestamp
+    )
+
+
+async def test_protocol_stats_sum_uint256_exactly(db):
+    pool = _pool()
+    db.add(pool)
+    await db.flush()
+    db.add_all([
+        Stake(
+            chain="sepolia", pool_id=pool.id, onchain_pool_id=0,
+            user_address="0x" + str(i) * 40, staked_amount=LARGE
+        )
+        for i in range(3)
+    ])
+    now = datetime.utcnow()
+    db.add_all([
+        _event(EventType.REWARD_CLAIMED, LARGE, now, 0),
+        _event(EventType.WITHDRAWN, LARGE, now, 1),
+    ])
+    await db.flush()
+
+    stats = await compute_protocol_stats(db, "sepolia")
+
+    assert stats["total_pools"] == 1
+    assert stats["total_stakers"] == 3
+    assert stats["total_staked"] == 3 * LARGE
+    assert stats["total_rewards"] == 2 * LARGE
+
+
+async def test_daily_rollup_sums_rewards_exactly(db):
+    day = datetime(2024, 3, 1, 12)
+    db.add_all([
+        _event(EventType.REWARD_CLAIMED, LARGE, day, 0),
+        _event(EventType.WITHDRAWN, LARGE, day, 1),
+        _event(EventType.STAKED, None, day, 2),
+    ])
+    await db.flush()
+
+    await rollup_daily_stats(db, "sepolia", day)
+    await db.flush()
+
+    daily = (await db.execute(select(DailyStats))).scalar_one()
+    assert daily.total_rewards_distributed == 2 * LARGE
+    assert daily.new_stakes == 1
+    assert daily.withdrawals == 1
+
+
+async def test_refresh_and_rollup_upsert_existing_rows(db):
+    db.add(_pool())
+    await db.flush()
+    day = datetime(2024, 3, 1, 12)
+
+    stats = await refresh_protocol_stats(db, "sepolia")
+    await rollup_daily_stats(db, "sepolia", day, stats)
+    db.add(_pool(pool_id=1))
+    db.add(_event(EventType.STAKED, None, day, 0))
+    await db.flush()
+    stats = await refresh_protocol_stats(db, "sepolia")
+    await rollup_daily_stats(db, "sepolia", day, stats)
+
+    snapshot = (await db.execute(select(ProtocolStatsSnapshot))).scalar_one()
+    assert snapshot.total_pools == 2
+    daily = (await db.execute(select(DailyStats))).scalar_one()
+    assert daily.new_stakes == 1
+
+
+async def test_finalizing_a_day_keeps_its_totals(db):
+    day = datetime(2024, 3, 1, 12)
+    await rollup_daily_stats(
+        db, "sepolia", day, {"total_staked": LARGE, "total_stakers": 5}
+    )
+    db.add(_event(EventType.STAKED, None, day, 0))
+    await db.flush()
+
+    await rollup_daily_stats(db, "sepolia", day)
+
+    daily = (await db.execute(select(DailyStats))).scalar_one()
+    assert daily.total_staked == LARGE
+    assert daily.unique_stakers == 5
+    assert daily.new_stakes == 1
+
+
+async def _daily_rows(db):
+    result = await db.execute(
+        select(DailyStats).order_by(DailyStats.date)
+        .execution_options(populate_existing=True)
+    )
+    return {row.date: row for row in result.scalars()}
+
+
+async def test_aggregation_rolls_up_past_days_without_rows(db):
+    now = datetime(2024, 3, 10, 15)
+    db.add(_pool())
+    db.add_all([
+        _event(EventType.STAKED, None, datetime(2024, 3, 1, 9), 0),
+        _event(EventType.REWARD_CLAIMED, LARGE, datetime(2024, 3, 3, 9), 1),
+    ])
+    await db.flush()
+
+    last_event_id = await aggregate_chain_stats(db, "sepolia", now)
+
+    rows = await _daily_rows(db)
+    assert sorted(rows) == [datetime(2024, 3, day) for day in (1, 2, 3, 10)]
+    assert rows[datetime(2024, 3, 1)].new_stakes == 1
+    assert rows[datetime(2024, 3, 3)].total_rewards_distributed == LARGE
+
+    # A backfilled event on an already rolled-up day is picked up next run
+    db.add(_event(EventType.STAKED, None, datetime(2024, 3, 1, 10), 2))
+    await db.flush()
+    await aggregate_chain_stats(db, "sepolia", now, last_event_id)
+
+    rows = await _daily_rows(db)
+    assert rows[datetime(2024, 3, 1)].new_stakes == 2
+
+
+async def test_aggregation_fills_days_since_last_rollup(db):
+    db.add(_pool())
+    await db.flush()
+    last_event_id = await aggregate_chain_stats(db, "sepolia", datetime(2024, 3, 1, 12))
+
+    await aggregate_chain_stats(db, "sepolia", datetime(2024, 3, 4, 1), last_event_id)
+
+    rows = await _daily_rows(db)
+    assert sorted(rows) == [datetime(2024, 3, 1) + timedelta(days=n) for n in range(4)]